@@ -7,6 +7,22 @@ DDL Converter Web Application
 Aplicação web para conversão de arquivos DDL para configurações MLOps
 com interface estilo FreeConverter.com
 
+Execução:
+    Local: python app.py (servidor do Werkzeug, sem o debugger)
+    Desenvolvimento (debugger interativo): DEV=1 python app.py
+    Produção (workers gthread, downloads via sendfile; ver wsgi.py):
+        gunicorn -k gthread --threads 8 -w 4 -b 0.0.0.0:5000 wsgi:application
+    Produção (workers gevent, I/O cooperativo durante upload/download):
+        gunicorn -k gevent -w 4 --worker-connections 1000 wsgi:application
+    Produção ASGI (Uvicorn, ver asgi.py):
+        uvicorn asgi:app --workers 4
+    Logs detalhados: LOG_LEVEL=DEBUG python app.py
+    Atrás de proxy reverso (nginx): PROXY_HOPS=1 (número de proxies confiáveis)
+
+Com vários workers cada processo tem seu próprio pool de parsing (os.cpu_count()
+processos); jobs interrompidos são retomados por um único worker, e o /status de
+um job em outro worker é atualizado pela releitura da base a cada STATUS_RECHECK.
+
 Autor: Felipe Machado
 """
 
@@ -16,21 +32,88 @@ import tempfile
 import zipfile
 import webbrowser
 import json
-import csv
 from datetime import datetime
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Flask, Request, Response, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.middleware.proxy_fix import ProxyFix
 from werkzeug.utils import secure_filename
 import os
 from pathlib import Path
 import atexit
+import copy
+import functools
+import hashlib
+import itertools
+import logging
+import secrets
+import socket
+import sqlite3
 import threading
 import time
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict
+from contextlib import contextmanager
+from queue import Queue
 
-from conversor_ddl import processar_arquivo_ddl, extrair_nome_tabela, ler_arquivo_ddl, extrair_informacoes_tabela
+try:
+    import orjson
+except ImportError:  # Opcional: sem orjson as respostas usam o json da stdlib
+    orjson = None
+
+from conversor_ddl import processar_arquivos_ddl, extrair_nome_tabela, ler_arquivo_ddl, extrair_informacoes_tabela, separar_comandos
 from comparador_json import processar_comparacao
 
+# Nível dos logs via LOG_LEVEL (padrão INFO): mensagens de debug não são formatadas se desabilitadas.
+# Configurado já na importação para cobrir as mensagens de inicialização; não altera um logging já configurado
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO').upper(), format='[%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+class UploadRequest(Request):
+    """Request que grava as partes multipart direto no diretório de upload"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # Evita o SpooledTemporaryFile em memória/`/tmp`: o corpo vai direto para o disco de upload
+        Path(app.config['UPLOAD_FOLDER']).mkdir(parents=True, exist_ok=True)
+        return tempfile.TemporaryFile(dir=app.config['UPLOAD_FOLDER'])
+
+class SaidaZip:
+    """Destino sem seek para o ZipFile: acumula o que foi escrito até o gerador repassar ao cliente"""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, dados):
+        self.partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self):
+        dados = b''.join(self.partes)
+        self.partes.clear()
+        return dados
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Serializa as respostas JSON com orjson (usado no polling de /status)"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.request_class = UploadRequest
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+# X-Forwarded-For/Proto só são confiáveis atrás de um proxy reverso (nginx) que os
+# reescreve; sem PROXY_HOPS o cliente poderia forjá-los
+PROXY_HOPS = int(os.environ.get('PROXY_HOPS', '0'))
+if PROXY_HOPS > 0:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS, x_proto=PROXY_HOPS)
 app.secret_key = 'ddl-converter-secret-key-2025'
 
 # Configurações - Usar Path para garantir caminhos corretos
@@ -38,20 +121,515 @@ BASE_DIR = Path(__file__).parent
 CACHE_DIR = BASE_DIR / 'cache'
 UPLOAD_FOLDER = str(CACHE_DIR / 'uploads')
 OUTPUT_FOLDER = str(CACHE_DIR / 'output')
-ALLOWED_EXTENSIONS = {'txt', 'ddl', 'sql', 'json'}
+OUTPUT_REAL = Path(OUTPUT_FOLDER).resolve()
+ALLOWED_EXTENSIONS = frozenset({'.txt', '.ddl', '.sql', '.json'})
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+UPLOAD_COPY_BUFFER = 1024 * 1024  # Buffer (por thread) da cópia de uploads para o disco
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['OUTPUT_FOLDER'] = OUTPUT_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 
-print(f"[INIT] BASE_DIR: {BASE_DIR}")
-print(f"[INIT] UPLOAD_FOLDER: {UPLOAD_FOLDER}")
-print(f"[INIT] OUTPUT_FOLDER: {OUTPUT_FOLDER}")
+logger.info("BASE_DIR: %s", BASE_DIR)
+logger.info("UPLOAD_FOLDER: %s", UPLOAD_FOLDER)
+logger.info("OUTPUT_FOLDER: %s", OUTPUT_FOLDER)
+
+# Controle de processamento: cada worker tem a própria fila; o estado dos jobs fica no SQLite
+NUM_WORKERS = 8
+
+class Worker:
+    """Worker de processamento com fila própria"""
+
+    def __init__(self, indice):
+        self.queue = Queue()
+        self.thread = threading.Thread(target=self._executar, name=f'ddl-{indice}', daemon=True)
+        self.thread.start()
+
+    def _executar(self):
+        while True:
+            tarefa = self.queue.get()
+            try:
+                tarefa()
+            except Exception as e:
+                logger.error("Falha no worker %s: %s", self.thread.name, e)
+            finally:
+                self.queue.task_done()
+
+WORKERS = [Worker(i) for i in range(NUM_WORKERS)]
+
+# Conjunto de hashes já processados, fatiado para não disputar uma única trava
+PROCESSED_SHARDS = [(threading.Lock(), set()) for _ in range(NUM_WORKERS)]
+
+def worker_do_job(thread_id):
+    """Retorna o worker responsável por um job"""
+    return WORKERS[hash(thread_id) % NUM_WORKERS]
+
+def arquivo_ja_processado(file_hash):
+    """Verifica se o hash já foi processado"""
+    lock, hashes = PROCESSED_SHARDS[hash(file_hash) % NUM_WORKERS]
+    with lock:
+        return file_hash in hashes
+
+def marcar_processado(file_hash):
+    """Registra o hash como processado"""
+    lock, hashes = PROCESSED_SHARDS[hash(file_hash) % NUM_WORKERS]
+    with lock:
+        hashes.add(file_hash)
+
+# Base de deduplicação persistida (hash do conteúdo -> saídas já geradas), fora do cache
+STATE_DIR = BASE_DIR / 'state'
+DEDUP_DB_PATH = STATE_DIR / 'hashdb.sqlite'
+DEDUP_LOCK = threading.Lock()
+
+def abrir_dedup_db():
+    """Abre (e cria, se preciso) a base SQLite de deduplicação"""
+    DEDUP_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(DEDUP_DB_PATH), check_same_thread=False, isolation_level=None)
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS dedup ('
+        'sha TEXT PRIMARY KEY, json_path TEXT, csv_path TEXT, nome_tabela TEXT, num_colunas INTEGER)'
+    )
+    return conn
+
+DEDUP_DB = abrir_dedup_db()
+
+# LRU em memória na frente da base (hash -> saídas), evita a consulta SQLite nos repetidos
+DEDUP_CACHE_SIZE = 256
+DEDUP_CACHE = OrderedDict()
+
+def _lembrar_dedup(file_hash, registro):
+    """Insere no LRU de deduplicação (chamar com DEDUP_LOCK)"""
+    DEDUP_CACHE[file_hash] = registro
+    DEDUP_CACHE.move_to_end(file_hash)
+    if len(DEDUP_CACHE) > DEDUP_CACHE_SIZE:
+        DEDUP_CACHE.popitem(last=False)
+
+def buscar_dedup(file_hash):
+    """Retorna as saídas geradas anteriormente para o hash, se existirem"""
+    with DEDUP_LOCK:
+        if file_hash in DEDUP_CACHE:
+            DEDUP_CACHE.move_to_end(file_hash)
+            return dict(DEDUP_CACHE[file_hash])
+        row = DEDUP_DB.execute(
+            'SELECT csv_path, json_path, nome_tabela, num_colunas FROM dedup WHERE sha = ?', (file_hash,)
+        ).fetchone()
+        if row is None:
+            return None
+        registro = {'caminho_csv': row[0], 'caminho_json': row[1], 'nome_tabela': row[2], 'num_colunas': row[3]}
+        _lembrar_dedup(file_hash, registro)
+    return dict(registro)
+
+def registrar_dedup(file_hash, caminho_csv, nome_tabela, num_colunas, caminho_json=None):
+    """Registra as saídas geradas para o hash do conteúdo"""
+    with DEDUP_LOCK:
+        DEDUP_DB.execute(
+            'INSERT OR REPLACE INTO dedup (sha, json_path, csv_path, nome_tabela, num_colunas) VALUES (?, ?, ?, ?, ?)',
+            (file_hash, caminho_json, caminho_csv, nome_tabela, num_colunas)
+        )
+        _lembrar_dedup(file_hash, {
+            'caminho_csv': caminho_csv,
+            'caminho_json': caminho_json,
+            'nome_tabela': nome_tabela,
+            'num_colunas': num_colunas
+        })
+
+def saida_reaproveitavel(file_hash):
+    """Retorna as saídas de um conteúdo já processado, se ainda estiverem em disco"""
+    if not arquivo_ja_processado(file_hash):
+        return None
+    anterior = buscar_dedup(file_hash)
+    if anterior and anterior['caminho_csv'] and os.path.exists(anterior['caminho_csv']):
+        return anterior
+    return None
+
+def resumo_reaproveitado(filename, anterior):
+    """Monta a entrada de resposta para um upload atendido pela base de hashes"""
+    return {
+        'filename': filename,
+        'nome_tabela': anterior['nome_tabela'],
+        'caminho_csv': os.path.basename(anterior['caminho_csv']),
+        'caminho_json': os.path.basename(anterior['caminho_json']) if anterior['caminho_json'] else None,
+        'num_colunas': anterior['num_colunas']
+    }
+
+def limpar_hashdb():
+    """Esquece todos os hashes processados"""
+    with DEDUP_LOCK:
+        DEDUP_DB.execute('DELETE FROM dedup')
+        DEDUP_CACHE.clear()
+    for lock, hashes in PROCESSED_SHARDS:
+        with lock:
+            hashes.clear()
+
+def carregar_hashdb():
+    """Recarrega os hashes processados em execuções anteriores"""
+    with DEDUP_LOCK:
+        hashes = [row[0] for row in DEDUP_DB.execute('SELECT sha FROM dedup')]
+    for file_hash in hashes:
+        marcar_processado(file_hash)
+    if hashes:
+        logger.info("%s hashes recarregados de %s", len(hashes), DEDUP_DB_PATH)
+
+carregar_hashdb()
+
+# Estado dos jobs em SQLite WAL: leitores concorrentes e contadores atualizados no próprio banco
+STATE_DB_PATH = CACHE_DIR / 'state.db'
+_estado_local = threading.local()
+
+def conexao_estado():
+    """Retorna a conexão com a base de estado da thread atual"""
+    conn = getattr(_estado_local, 'conn', None)
+    if conn is None:
+        STATE_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(STATE_DB_PATH), isolation_level=None, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        _estado_local.conn = conn
+    return conn
+
+@contextmanager
+def transacao_estado():
+    """Executa um bloco de escritas na base de estado como uma única transação"""
+    conn = conexao_estado()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+def criar_tabelas_estado():
+    """Cria as tabelas de status, resultados e erros dos jobs"""
+    conexao_estado().executescript(
+        'CREATE TABLE IF NOT EXISTS status ('
+        'thread_id TEXT PRIMARY KEY, status TEXT, total INTEGER, completed INTEGER DEFAULT 0, '
+        'progress INTEGER DEFAULT 0, message TEXT);'
+        'CREATE TABLE IF NOT EXISTS resultados ('
+        'id INTEGER PRIMARY KEY AUTOINCREMENT, thread_id TEXT, nome_tabela TEXT, '
+        'caminho_csv TEXT, num_colunas INTEGER);'
+        'CREATE TABLE IF NOT EXISTS erros ('
+        'id INTEGER PRIMARY KEY AUTOINCREMENT, thread_id TEXT, filename TEXT, error TEXT);'
+        'CREATE INDEX IF NOT EXISTS idx_resultados_job ON resultados (thread_id);'
+        'CREATE INDEX IF NOT EXISTS idx_erros_job ON erros (thread_id);'
+    )
+    # Bases antigas não têm a lista de arquivos (retomada), o horário de conclusão (poda)
+    # nem o processo dono do job
+    for coluna in ('arquivos TEXT', 'concluido_em REAL', 'dono TEXT'):
+        try:
+            conexao_estado().execute(f'ALTER TABLE status ADD COLUMN {coluna}')
+        except sqlite3.OperationalError:
+            pass
+
+criar_tabelas_estado()
+
+# Long-polling do /status: uma Condition por job, notificada a cada avanço
+STATUS_WAIT_MAX = 25
+STATUS_RECHECK = 1  # Releitura da base enquanto aguarda (job em outro worker)
+JOB_CONDS = {}  # thread_id -> [Condition, nº de threads aguardando]
+JOB_CONDS_LOCK = threading.Lock()
+
+def condicao_job(thread_id):
+    """Retorna (criando se preciso) a Condition do job, registrando mais um interessado"""
+    with JOB_CONDS_LOCK:
+        entrada = JOB_CONDS.setdefault(thread_id, [threading.Condition(), 0])
+        entrada[1] += 1
+        return entrada[0]
+
+def liberar_condicao_job(thread_id):
+    """Desfaz o registro de condicao_job; o último interessado remove a Condition"""
+    with JOB_CONDS_LOCK:
+        entrada = JOB_CONDS.get(thread_id)
+        if entrada is not None:
+            entrada[1] -= 1
+            if entrada[1] <= 0:
+                del JOB_CONDS[thread_id]
+
+def notificar_job(thread_id):
+    """Acorda quem aguarda o status do job"""
+    with JOB_CONDS_LOCK:
+        entrada = JOB_CONDS.get(thread_id)
+    if entrada is not None:
+        with entrada[0]:
+            entrada[0].notify_all()
+
+def aguardar_job(thread_id, pronto, timeout):
+    """Aguarda até pronto() ser verdadeiro ou o timeout expirar
+    
+    A Condition só é notificada pelo processo que executa o job; com vários
+    workers o job pode estar em outro processo, então a base também é relida
+    a cada STATUS_RECHECK segundos.
+    
+    Returns:
+        True se pronto() ficou verdadeiro dentro do prazo
+    """
+    limite = time.monotonic() + timeout
+    cond = condicao_job(thread_id)
+    try:
+        with cond:
+            while not pronto():
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return False
+                cond.wait(min(restante, STATUS_RECHECK))
+        return True
+    finally:
+        liberar_condicao_job(thread_id)
+
+# Histórico de jobs concluídos: no máximo JOB_HISTORY_MAX, e nenhum mais velho que JOB_TTL
+JOB_HISTORY_MAX = 1024
+JOB_TTL = 60 * 60
+JOB_PODA_INTERVALO = 64  # Poda a cada N jobs iniciados
+_jobs_iniciados = itertools.count(1)
+
+def podar_jobs():
+    """Remove da base os jobs concluídos antigos ou além do limite do histórico"""
+    with transacao_estado() as conn:
+        conn.execute(
+            "DELETE FROM status WHERE status = 'completed' AND ("
+            "concluido_em < ? OR thread_id NOT IN ("
+            "SELECT thread_id FROM status WHERE status = 'completed' "
+            "ORDER BY concluido_em DESC LIMIT ?))",
+            (time.time() - JOB_TTL, JOB_HISTORY_MAX)
+        )
+        conn.execute('DELETE FROM resultados WHERE thread_id NOT IN (SELECT thread_id FROM status)')
+        conn.execute('DELETE FROM erros WHERE thread_id NOT IN (SELECT thread_id FROM status)')
+
+# Token da instância: distingue este processo de um anterior que teve o mesmo pid
+PROCESSO_TOKEN = secrets.token_hex(4)
 
-# Variáveis globais para controle de processamento
-processing_status = {}
-processed_files = set()
+def dono_processo():
+    """Identifica este processo como dono dos jobs que executa"""
+    return f"{socket.gethostname()}:{os.getpid()}:{PROCESSO_TOKEN}"
+
+def dono_ativo(dono):
+    """Indica se o processo dono de um job ainda pode estar executando-o"""
+    if dono is None:
+        return False
+    if dono == dono_processo():
+        return True
+    host, _, resto = dono.partition(':')
+    pid = resto.partition(':')[0]
+    if host != socket.gethostname():
+        # Processo de outra máquina: não há como verificar, o job fica com ele
+        return True
+    if pid == str(os.getpid()) or os.name == 'nt':
+        # Mesmo pid com outro token é uma execução anterior. No Windows os.kill(pid, 0)
+        # encerraria o processo; lá a aplicação roda em um único processo
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except (ProcessLookupError, ValueError):
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def iniciar_job(thread_id, arquivos):
+    """Registra um novo job de processamento, guardando os arquivos para poder retomá-lo"""
+    if next(_jobs_iniciados) % JOB_PODA_INTERVALO == 0:
+        podar_jobs()
+    conexao_estado().execute(
+        "INSERT INTO status (thread_id, status, total, completed, progress, message, arquivos, concluido_em, dono) "
+        "VALUES (?, 'processing', ?, 0, 0, NULL, ?, NULL, ?)",
+        (thread_id, len(arquivos), json.dumps(arquivos), dono_processo())
+    )
+
+def reivindicar_job(thread_id, dono_anterior):
+    """Assume um job interrompido, zerando o progresso para reprocessá-lo
+    
+    A troca de dono só acontece se ninguém o assumiu desde a leitura, então entre
+    vários processos retomando ao mesmo tempo apenas um fica com o job.
+    
+    Args:
+        thread_id: Identificador do job
+        dono_anterior: Dono lido em jobs_pendentes (None em bases antigas)
+    
+    Returns:
+        True se este processo passou a ser o dono do job
+    """
+    with transacao_estado() as conn:
+        cursor = conn.execute(
+            "UPDATE status SET dono = ?, completed = 0, progress = 0, message = NULL "
+            "WHERE thread_id = ? AND status = 'processing' AND dono IS ?",
+            (dono_processo(), thread_id, dono_anterior)
+        )
+        if cursor.rowcount != 1:
+            return False
+        conn.execute('DELETE FROM resultados WHERE thread_id = ?', (thread_id,))
+        conn.execute('DELETE FROM erros WHERE thread_id = ?', (thread_id,))
+    return True
+
+def jobs_pendentes():
+    """Lista (thread_id, arquivos, dono) dos jobs que não terminaram"""
+    rows = conexao_estado().execute(
+        "SELECT thread_id, arquivos, dono FROM status WHERE status = 'processing' AND arquivos IS NOT NULL"
+    ).fetchall()
+    return [(thread_id, json.loads(arquivos), dono) for thread_id, arquivos, dono in rows]
+
+def _avancar_job(conn, thread_id, mensagem=None):
+    """Avança o contador do job; o status só vira 'completed' no último arquivo"""
+    conn.execute(
+        "UPDATE status SET completed = completed + 1, "
+        "progress = ((completed + 1) * 100) / MAX(total, 1), "
+        "status = CASE WHEN completed + 1 >= total THEN 'completed' ELSE status END, "
+        "message = COALESCE(?, message) WHERE thread_id = ?",
+        (mensagem, thread_id)
+    )
+
+def registrar_resultado_job(thread_id, resultado, mensagem):
+    """Grava o resultado de um arquivo e avança o contador do job"""
+    with transacao_estado() as conn:
+        conn.execute(
+            'INSERT INTO resultados (thread_id, nome_tabela, caminho_csv, num_colunas) VALUES (?, ?, ?, ?)',
+            (thread_id, resultado['nome_tabela'], resultado['caminho_csv'], resultado['num_colunas'])
+        )
+        _avancar_job(conn, thread_id, mensagem)
+    notificar_job(thread_id)
+
+def registrar_erro_job(thread_id, filename, erro):
+    """Grava a falha de um arquivo e avança o contador do job"""
+    with transacao_estado() as conn:
+        conn.execute(
+            'INSERT INTO erros (thread_id, filename, error) VALUES (?, ?, ?)',
+            (thread_id, filename, erro)
+        )
+        _avancar_job(conn, thread_id)
+    notificar_job(thread_id)
+
+def concluir_job(thread_id):
+    """Marca o job como concluído"""
+    conexao_estado().execute(
+        "UPDATE status SET status = 'completed', progress = 100, arquivos = NULL, concluido_em = ? "
+        "WHERE thread_id = ?", (time.time(), thread_id)
+    )
+    notificar_job(thread_id)
+
+def ler_status_job(thread_id):
+    """Monta o status do job a partir da base, ou None se não existir"""
+    conn = conexao_estado()
+    row = conn.execute(
+        'SELECT status, total, completed, progress, message FROM status WHERE thread_id = ?', (thread_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    resultados = [
+        {'sucesso': True, 'nome_tabela': r[0], 'caminho_csv': r[1], 'num_colunas': r[2]}
+        for r in conn.execute(
+            'SELECT nome_tabela, caminho_csv, num_colunas FROM resultados WHERE thread_id = ? ORDER BY id',
+            (thread_id,)
+        )
+    ]
+    erros = [
+        {'filename': r[0], 'error': r[1]}
+        for r in conn.execute('SELECT filename, error FROM erros WHERE thread_id = ? ORDER BY id', (thread_id,))
+    ]
+    return {
+        'status': row[0],
+        'total': row[1],
+        'completed': row[2],
+        'progress': row[3],
+        'message': row[4],
+        'results': resultados,
+        'errors': erros
+    }
+
+# Assinatura do esquema extraído -> CSV já gravado (evita reescrever saídas idênticas)
+OUTPUT_MEMO = {}
+
+# Índice dos arquivos de saída (nome relativo -> caminho absoluto), evita stat por download
+OUTPUT_INDEX = {}
+OUTPUT_INDEX_LOCK = threading.RLock()
+
+def _varrer_saidas(pasta, prefixo=''):
+    """Percorre a pasta de saída com scandir, gerando (nome relativo, caminho)"""
+    with os.scandir(pasta) as entradas:
+        for entrada in entradas:
+            if entrada.is_dir(follow_symlinks=False):
+                yield from _varrer_saidas(entrada.path, f"{prefixo}{entrada.name}/")
+            elif entrada.is_file():
+                yield f"{prefixo}{entrada.name}", entrada.path
+
+def listar_arquivos(pasta, sufixo=''):
+    """Nomes dos arquivos (não recursivo) da pasta via scandir, filtrando pelo sufixo"""
+    with os.scandir(pasta) as entradas:
+        return [e.name for e in entradas if e.name.endswith(sufixo) and e.is_file()]
+
+def indexar_saidas():
+    """Reconstrói o índice a partir do conteúdo atual da pasta de saída"""
+    try:
+        arquivos = dict(_varrer_saidas(OUTPUT_FOLDER))
+    except FileNotFoundError:
+        arquivos = {}
+    with OUTPUT_INDEX_LOCK:
+        OUTPUT_INDEX.clear()
+        OUTPUT_INDEX.update(arquivos)
+
+def registrar_saida(caminho):
+    """Inclui no índice um arquivo recém-gravado na pasta de saída"""
+    caminho = os.path.abspath(caminho)
+    nome = Path(os.path.relpath(caminho, os.path.abspath(OUTPUT_FOLDER))).as_posix()
+    with OUTPUT_INDEX_LOCK:
+        OUTPUT_INDEX[nome] = caminho
+
+indexar_saidas()
+
+# DDLs já analisados no /compare (hash do conteúdo -> nome e informações da tabela)
+DDL_PARSE_CACHE_SIZE = 128
+DDL_PARSE_CACHE = OrderedDict()
+DDL_PARSE_LOCK = threading.Lock()
+
+def analise_ddl_em_cache(ddl_hash):
+    """Retorna uma cópia de (nome_tabela, info_tabela) já extraídos para o hash, se houver"""
+    with DDL_PARSE_LOCK:
+        if ddl_hash not in DDL_PARSE_CACHE:
+            return None
+        DDL_PARSE_CACHE.move_to_end(ddl_hash)
+        nome_tabela, info_tabela = DDL_PARSE_CACHE[ddl_hash]
+    return nome_tabela, copy.deepcopy(info_tabela)
+
+def guardar_analise_ddl(ddl_hash, nome_tabela, info_tabela):
+    """Guarda no LRU o resultado da extração do DDL"""
+    with DDL_PARSE_LOCK:
+        DDL_PARSE_CACHE[ddl_hash] = (nome_tabela, copy.deepcopy(info_tabela))
+        DDL_PARSE_CACHE.move_to_end(ddl_hash)
+        if len(DDL_PARSE_CACHE) > DDL_PARSE_CACHE_SIZE:
+            DDL_PARSE_CACHE.popitem(last=False)
+
+# Pool para gravar em paralelo os arquivos de um mesmo upload
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix='upload')
+
+# Buffers de cópia de upload, um por thread (ver buffer_copia)
+BUFFER_LOCAL = threading.local()
+
+# Pool de processos para o parsing dos DDLs (CPU, fora do GIL); criado sob demanda
+PARSE_LOTE_MAX = 8  # Máximo de arquivos por tarefa enviada ao pool
+PARSE_POOL = None
+PARSE_POOL_LOCK = threading.Lock()
+
+def obter_pool_parse(quebrado=None):
+    """Retorna o pool de processos de parsing, criando-o na primeira chamada
+    
+    Args:
+        quebrado: Pool que falhou no job chamador; só é substituído se ainda for o
+            pool atual (outro job pode já tê-lo recriado)
+    """
+    global PARSE_POOL
+    with PARSE_POOL_LOCK:
+        if quebrado is not None and PARSE_POOL is quebrado:
+            # Sem cancel_futures: lotes de outros jobs no pool antigo terminam normalmente
+            PARSE_POOL.shutdown(wait=False)
+            PARSE_POOL = None
+        if PARSE_POOL is None:
+            PARSE_POOL = ProcessPoolExecutor(max_workers=os.cpu_count())
+        return PARSE_POOL
+
+@atexit.register
+def encerrar_pool_parse():
+    """Encerra o pool de parsing vigente ao sair do processo"""
+    with PARSE_POOL_LOCK:
+        if PARSE_POOL is not None:
+            PARSE_POOL.shutdown(wait=False)
 
 def get_safe_path(*parts):
     """Cria um caminho seguro usando Path"""
@@ -59,7 +637,65 @@ def get_safe_path(*parts):
 
 def allowed_file(filename):
     """Verifica se o arquivo tem extensão permitida"""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    # splitext devolve '' para nomes sem extensão, dispensando o teste de '.'
+    return os.path.splitext(filename)[1].lower() in ALLOWED_EXTENSIONS
+
+def novo_hash():
+    """Hash de conteúdo usado na deduplicação (BLAKE2b de 128 bits)"""
+    return hashlib.blake2b(digest_size=16)
+
+def salvar_upload(arquivo, destino):
+    """Calcula o hash do upload em memória e só grava em disco se o conteúdo for inédito
+    
+    Retorna a tupla (hash, saídas reaproveitadas ou None).
+    """
+    # O tamanho já é limitado por MAX_CONTENT_LENGTH
+    dados = arquivo.stream.read(MAX_CONTENT_LENGTH)
+    h = novo_hash()
+    h.update(dados)
+    file_hash = h.hexdigest()
+    anterior = saida_reaproveitavel(file_hash)
+    if anterior:
+        return file_hash, anterior
+    with open(destino, 'wb') as saida:
+        saida.write(dados)
+    return file_hash, None
+
+def buffer_copia():
+    """Buffer de cópia de uploads reaproveitado por thread (sem alocar um bloco novo a cada arquivo)"""
+    buf = getattr(BUFFER_LOCAL, 'buf', None)
+    if buf is None:
+        buf = BUFFER_LOCAL.buf = bytearray(UPLOAD_COPY_BUFFER)
+    return buf
+
+def gravar_se_mudou(dados, destino):
+    """Grava os bytes só se o conteúdo atual do destino for outro (preserva o mtime dos caches por arquivo)"""
+    try:
+        if os.path.getsize(destino) == len(dados) and Path(destino).read_bytes() == dados:
+            return False
+    except FileNotFoundError:
+        pass
+    with open(destino, 'wb') as saida:
+        saida.write(dados)
+    return True
+
+def esvaziar_pasta(pasta):
+    """Remove o conteúdo da pasta mantendo a própria pasta (recriada só se tiver sumido)"""
+    try:
+        entradas = os.scandir(pasta)
+    except FileNotFoundError:
+        os.makedirs(pasta, mode=0o755, exist_ok=True)
+        return
+    with entradas:
+        for entrada in entradas:
+            try:
+                if entrada.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entrada.path)
+                else:
+                    os.unlink(entrada.path)
+            except FileNotFoundError:
+                # Removido por outra requisição no meio da varredura
+                pass
 
 def setup_directories():
     """Cria diretórios necessários com permissões apropriadas"""
@@ -78,36 +714,186 @@ def setup_directories():
         # Verifica permissões de escrita
         can_write = os.access(str(upload_path), os.W_OK) and os.access(str(output_path), os.W_OK)
         
-        print(f"[SETUP] CACHE_DIR: {CACHE_DIR.absolute()}")
-        print(f"[SETUP] UPLOAD_FOLDER: {upload_path.absolute()} (acesso escrita: {'sim' if os.access(str(upload_path), os.W_OK) else 'não'})")
-        print(f"[SETUP] OUTPUT_FOLDER: {output_path.absolute()} (acesso escrita: {'sim' if os.access(str(output_path), os.W_OK) else 'não'})")
+        logger.info("CACHE_DIR: %s", CACHE_DIR.absolute())
+        logger.info("UPLOAD_FOLDER: %s (acesso escrita: %s)", upload_path.absolute(), 'sim' if os.access(str(upload_path), os.W_OK) else 'não')
+        logger.info("OUTPUT_FOLDER: %s (acesso escrita: %s)", output_path.absolute(), 'sim' if os.access(str(output_path), os.W_OK) else 'não')
         
         if not can_write:
-            print("[ERRO] Sem permissão de escrita nos diretórios necessários")
+            logger.error("Sem permissão de escrita nos diretórios necessários")
             
         return can_write
         
     except Exception as e:
         error_msg = f"Erro ao configurar diretórios: {str(e)}"
-        print(f"[ERROR] {error_msg}")
+        logger.error("%s", error_msg)
         import traceback
         traceback.print_exc()
         return False
 
+# Serializa limpezas concorrentes (/clear_cache chamado em paralelo)
+CLEANUP_LOCK = threading.Lock()
+
 def cleanup_cache():
     """Limpa o cache ao iniciar a aplicação"""
     cache_path = str(CACHE_DIR)
-    if os.path.exists(cache_path):
-        shutil.rmtree(cache_path)
-    setup_directories()
-    processed_files.clear()
-    processing_status.clear()
-    print(f"[CACHE] Diretório cache limpo: {cache_path}")
+    with CLEANUP_LOCK:
+        # A base de hashes (state/) sobrevive à limpeza; entradas cujas saídas
+        # sumiram são ignoradas e reprocessadas quando o conteúdo voltar.
+        # As pastas são mantidas: só o conteúdo é removido, sem recriar/checar permissões
+        for pasta in (UPLOAD_FOLDER, OUTPUT_FOLDER):
+            esvaziar_pasta(pasta)
+        _hash_conteudo.cache_clear()
+        OUTPUT_MEMO.clear()
+        with DDL_PARSE_LOCK:
+            DDL_PARSE_CACHE.clear()
+        with transacao_estado() as conn:
+            for tabela in ('status', 'resultados', 'erros'):
+                conn.execute(f'DELETE FROM {tabela}')
+        with JOB_CONDS_LOCK:
+            pendentes = list(JOB_CONDS)
+        for thread_id in pendentes:
+            notificar_job(thread_id)
+        indexar_saidas()
+    logger.info("Diretório cache limpo: %s", cache_path)
+
+HASH_CHUNK_SIZE = 1 << 20
+HASH_SMALL_FILE = 64 * 1024
+
+@functools.lru_cache(maxsize=4096)
+def _hash_conteudo(caminho_abs, tamanho, mtime_ns):
+    """Hash do conteúdo, memoizado por (caminho, tamanho, mtime_ns)"""
+    h = novo_hash()
+    with open(caminho_abs, 'rb', buffering=0) as f:
+        if tamanho < HASH_SMALL_FILE:
+            # Arquivos pequenos: uma única leitura
+            h.update(f.read())
+        else:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                h.update(chunk)
+    return h.hexdigest()
 
 def get_file_hash(filepath):
-    """Gera hash simples do arquivo baseado no nome e tamanho"""
+    """Gera o hash do conteúdo do arquivo"""
     stat = os.stat(filepath)
-    return f"{os.path.basename(filepath)}_{stat.st_size}_{int(stat.st_mtime)}"
+    return _hash_conteudo(os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+
+def concluir_arquivo(thread_id, file_info, file_hash, resultado):
+    """Registra no job o resultado de um arquivo"""
+    if resultado['sucesso']:
+        # Marcar como processado
+        marcar_processado(file_hash)
+        
+        # Extrair apenas o nome do arquivo para download
+        nome_csv = os.path.basename(resultado['caminho_csv'])
+        registrar_resultado_job(
+            thread_id,
+            {
+                'nome_tabela': resultado['nome_tabela'],
+                'caminho_csv': nome_csv,
+                'num_colunas': resultado['num_colunas']
+            },
+            f'Arquivo processado com sucesso! Tabela: {resultado["nome_tabela"]}'
+        )
+    else:
+        registrar_erro_job(thread_id, file_info['filename'], resultado['erro'])
+
+def concluir_lote(thread_id, lote, resultados):
+    """Registra no job os resultados de um lote de arquivos parseados"""
+    for (file_info, file_hash), resultado in zip(lote, resultados):
+        try:
+            if resultado['sucesso']:
+                OUTPUT_MEMO[resultado['assinatura']] = resultado['caminho_csv']
+                registrar_saida(resultado['caminho_csv'])
+                registrar_dedup(file_hash, resultado['caminho_csv'],
+                                resultado['nome_tabela'], resultado['num_colunas'])
+            concluir_arquivo(thread_id, file_info, file_hash, resultado)
+        except Exception as e:
+            registrar_erro_job(thread_id, file_info['filename'], str(e))
+
+def processar_job(thread_id, files_to_process):
+    """Processa os arquivos de um job (executado na fila de um Worker)"""
+    # O worker orquestra e atualiza o status; o parsing vai para o pool de processos.
+    # Cada processo recebe uma cópia do memo de saídas e devolve a assinatura gerada
+    try:
+        pool = obter_pool_parse()
+        memo = dict(OUTPUT_MEMO)
+        pendentes = []
+        for file_info in files_to_process:
+            try:
+                filepath = file_info['filepath']
+                # Uploads já trazem o hash; caminhos informados diretamente são calculados aqui
+                file_hash = file_info.get('hash') or get_file_hash(filepath)
+                
+                # Reaproveitar as saídas de um conteúdo idêntico já processado
+                anterior = saida_reaproveitavel(file_hash)
+                if anterior:
+                    concluir_arquivo(thread_id, file_info, file_hash, dict(anterior, sucesso=True, erro=None))
+                else:
+                    pendentes.append((file_info, file_hash))
+            except Exception as e:
+                registrar_erro_job(thread_id, file_info['filename'], str(e))
+        
+        # Lotes de até PARSE_LOTE_MAX arquivos por envio ao pool, mantendo todos os processos ocupados
+        tamanho = min(PARSE_LOTE_MAX, max(1, len(pendentes) // (os.cpu_count() or 1)))
+        futuros = {}
+        locais = []
+        for i in range(0, len(pendentes), tamanho):
+            lote = pendentes[i:i + tamanho]
+            caminhos = [file_info['filepath'] for file_info, _ in lote]
+            try:
+                futuros[pool.submit(processar_arquivos_ddl, caminhos, app.config['OUTPUT_FOLDER'], memo)] = (lote, caminhos, pool)
+            except RuntimeError:
+                # Pool quebrado ou já substituído: este lote roda aqui, os seguintes no pool vigente
+                pool = obter_pool_parse(quebrado=pool)
+                locais.append((lote, caminhos))
+        
+        # Status avança na ordem em que os lotes terminam, não na ordem de envio
+        for futuro in as_completed(futuros):
+            lote, caminhos, usado = futuros[futuro]
+            try:
+                resultados = futuro.result()
+            except (BrokenProcessPool, CancelledError):
+                # Um processo morreu: recria o pool (se ninguém o fez) e processa aqui
+                obter_pool_parse(quebrado=usado)
+                locais.append((lote, caminhos))
+                continue
+            except Exception as e:
+                for file_info, _ in lote:
+                    registrar_erro_job(thread_id, file_info['filename'], str(e))
+                continue
+            concluir_lote(thread_id, lote, resultados)
+        
+        for lote, caminhos in locais:
+            try:
+                resultados = processar_arquivos_ddl(caminhos, app.config['OUTPUT_FOLDER'], memo)
+            except Exception as e:
+                for file_info, _ in lote:
+                    registrar_erro_job(thread_id, file_info['filename'], str(e) or type(e).__name__)
+                continue
+            concluir_lote(thread_id, lote, resultados)
+    finally:
+        # Mesmo com falha inesperada o job não fica preso em 'processing'
+        concluir_job(thread_id)
+
+def enfileirar_job(thread_id, files_to_process):
+    """Coloca o job na fila do worker responsável"""
+    worker_do_job(thread_id).queue.put(functools.partial(processar_job, thread_id, files_to_process))
+
+def retomar_jobs():
+    """Reenfileira os jobs interrompidos por uma parada do servidor
+    
+    Só são retomados os jobs cujo processo dono morreu e que este processo conseguiu
+    reivindicar; com vários workers cada job volta em apenas um deles. Arquivos que
+    já tinham terminado voltam como acertos da base de hashes.
+    """
+    retomados = 0
+    for thread_id, arquivos, dono in jobs_pendentes():
+        if dono_ativo(dono) or not reivindicar_job(thread_id, dono):
+            continue
+        enfileirar_job(thread_id, arquivos)
+        retomados += 1
+    if retomados:
+        logger.info("%s job(s) pendente(s) retomado(s)", retomados)
 
 # Rotas da aplicação
 @app.route('/')
@@ -127,8 +913,11 @@ def upload_files():
             return jsonify({'success': False, 'error': 'Nenhum arquivo selecionado'})
         
         uploaded_files = []
-        skipped_files = []
+        skipped_files = set()
+        cached_files = []
         
+        # Selecionar arquivos válidos (o último com o mesmo nome prevalece)
+        pendentes = {}
         for file in files:
             if file and file.filename != '':
                 if not allowed_file(file.filename):
@@ -136,33 +925,109 @@ def upload_files():
                 
                 filename = secure_filename(file.filename)
                 filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                
-                # Salvar arquivo
-                file.save(filepath)
-                
-                # Verificar se já foi processado
-                file_hash = get_file_hash(filepath)
-                if file_hash in processed_files:
-                    skipped_files.append(filename)
-                    os.remove(filepath)  # Remove arquivo duplicado
-                    continue
-                
-                uploaded_files.append({
-                    'filename': filename,
-                    'filepath': filepath,
-                    'hash': file_hash
-                })
+                pendentes[filepath] = file
+        
+        # Salvar arquivos em lote, com as escritas sobrepostas no pool de I/O;
+        # duplicatas são detectadas pelo hash antes de qualquer escrita
+        salvos = IO_EXECUTOR.map(lambda item: salvar_upload(item[1], item[0]), pendentes.items())
+        
+        for filepath, (file_hash, anterior) in zip(pendentes, salvos):
+            filename = os.path.basename(filepath)
+            
+            # Conteúdo já processado: nada foi gravado, devolve as saídas existentes
+            if anterior:
+                skipped_files.add(filename)
+                cached_files.append(resumo_reaproveitado(filename, anterior))
+                continue
+            
+            uploaded_files.append({
+                'filename': filename,
+                'filepath': filepath,
+                'hash': file_hash
+            })
         
         return jsonify({
             'success': True,
             'uploaded_files': uploaded_files,
-            'skipped_files': skipped_files,
+            'skipped_files': sorted(skipped_files),
+            'cached_files': cached_files,
             'message': f'{len(uploaded_files)} arquivos enviados com sucesso'
         })
         
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/upload_stream', methods=['POST'])
+def upload_stream():
+    """
+    Endpoint para upload de um único arquivo enviado como corpo bruto
+
+    O nome do arquivo vem do parâmetro `filename` (ou do header X-Filename) e o
+    corpo é gravado em blocos num temporário da pasta de upload, sem passar pelo
+    parser multipart; só um conteúdo inédito substitui o arquivo com esse nome.
+    Ex.: curl -XPOST --data-binary @tabela.ddl "http://localhost:5000/upload_stream?filename=tabela.ddl"
+    """
+    try:
+        nome_original = request.args.get('filename') or request.headers.get('X-Filename', '')
+        if not nome_original:
+            return jsonify({'success': False, 'error': 'Nome do arquivo não informado'})
+        
+        if not allowed_file(nome_original):
+            return jsonify({'success': False, 'error': f'Extensão não permitida: {nome_original}'})
+        
+        filename = secure_filename(nome_original)
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        
+        # Um job na fila pode estar para ler o arquivo com esse nome: nada de truncá-lo
+        # ou removê-lo antes de saber se o conteúdo é novo
+        Path(app.config['UPLOAD_FOLDER']).mkdir(parents=True, exist_ok=True)
+        h = novo_hash()
+        buf = buffer_copia()
+        fd, temporario = tempfile.mkstemp(dir=app.config['UPLOAD_FOLDER'], suffix='.tmp')
+        try:
+            try:
+                with memoryview(buf) as view:
+                    while (n := request.stream.readinto(buf)):
+                        bloco = view[:n]
+                        h.update(bloco)
+                        os.write(fd, bloco)
+            finally:
+                os.close(fd)
+            
+            # Verificar se já foi processado
+            file_hash = h.hexdigest()
+            anterior = saida_reaproveitavel(file_hash)
+            if not anterior:
+                os.chmod(temporario, 0o644)
+                os.replace(temporario, filepath)
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        
+        if anterior:
+            return jsonify({
+                'success': True,
+                'uploaded_files': [],
+                'skipped_files': [filename],
+                'cached_files': [resumo_reaproveitado(filename, anterior)],
+                'message': '0 arquivos enviados com sucesso'
+            })
+        
+        return jsonify({
+            'success': True,
+            'uploaded_files': [{
+                'filename': filename,
+                'filepath': filepath,
+                'hash': file_hash
+            }],
+            'skipped_files': [],
+            'cached_files': [],
+            'message': '1 arquivos enviados com sucesso'
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 @app.route('/process', methods=['POST'])
 def process_files():
     """Endpoint para processar arquivos DDL"""
@@ -173,64 +1038,10 @@ def process_files():
         if not files_to_process:
             return jsonify({'success': False, 'error': 'Nenhum arquivo para processar'})
         
-        # Iniciar processamento em thread separada
-        thread_id = str(int(time.time()))
-        processing_status[thread_id] = {
-            'status': 'processing',
-            'total': len(files_to_process),
-            'completed': 0,
-            'results': [],
-            'errors': []
-        }
-        
-        def process_in_background():
-            for file_info in files_to_process:
-                try:
-                    filepath = file_info['filepath']
-                    file_hash = file_info['hash']
-                    
-                    # Processar arquivo
-                    resultado = processar_arquivo_ddl(filepath, app.config['OUTPUT_FOLDER'])
-                    
-                    if resultado['sucesso']:
-                        # Marcar como processado
-                        processed_files.add(file_hash)
-                        
-                        # Extrair apenas o nome do arquivo para download
-                        nome_csv = os.path.basename(resultado['caminho_csv'])
-                        
-                        
-                        processing_status[thread_id] = {
-                            'status': 'completed',
-                            'progress': 100,
-                            'message': f'Arquivo processado com sucesso! Tabela: {resultado["nome_tabela"]}',
-                            'result': {
-                                'sucesso': True,
-                                'nome_tabela': resultado['nome_tabela'],
-                                'caminho_csv': nome_csv,
-                                'num_colunas': resultado['num_colunas']
-                            }
-                        }
-                    else:
-                        processing_status[thread_id]['errors'].append({
-                            'filename': file_info['filename'],
-                            'error': resultado['erro']
-                        })
-                    
-                    processing_status[thread_id]['completed'] += 1
-                    
-                except Exception as e:
-                    processing_status[thread_id]['errors'].append({
-                        'filename': file_info['filename'],
-                        'error': str(e)
-                    })
-                    processing_status[thread_id]['completed'] += 1
-            
-            processing_status[thread_id]['status'] = 'completed'
-        
-        thread = threading.Thread(target=process_in_background)
-        thread.daemon = True
-        thread.start()
+        # Registrar o job (persistido, sobrevive a reinícios) e enfileirar no worker responsável
+        thread_id = secrets.token_hex(8)
+        iniciar_job(thread_id, files_to_process)
+        enfileirar_job(thread_id, files_to_process)
         
         return jsonify({
             'success': True,
@@ -243,69 +1054,129 @@ def process_files():
 
 @app.route('/status/<thread_id>')
 def get_status(thread_id):
-    """Endpoint para verificar status do processamento"""
-    if thread_id not in processing_status:
+    """
+    Endpoint para verificar status do processamento
+    
+    Com `?since=<completed>` a resposta aguarda (até STATUS_WAIT_MAX segundos)
+    o job avançar além desse contador, em vez de o cliente consultar em laço.
+    """
+    status = ler_status_job(thread_id)
+    since = request.args.get('since', type=int)
+    
+    def sem_novidade(atual):
+        return atual is not None and atual['status'] != 'completed' and atual['completed'] <= since
+    
+    if since is not None and sem_novidade(status):
+        espera = min(request.args.get('timeout', STATUS_WAIT_MAX, type=float), STATUS_WAIT_MAX)
+        aguardar_job(thread_id, lambda: not sem_novidade(ler_status_job(thread_id)), espera)
+        status = ler_status_job(thread_id)
+    
+    if status is None:
         return jsonify({'success': False, 'error': 'Thread não encontrada'})
     
     return jsonify({
         'success': True,
-        'status': processing_status[thread_id]
+        'status': status
     })
 
+@app.route('/status_stream/<thread_id>')
+def status_stream(thread_id):
+    """
+    Endpoint Server-Sent Events com o status do processamento
+    
+    Envia um evento a cada mudança de status até o job terminar, numa única conexão
+    (no navegador: new EventSource('/status_stream/<thread_id>')).
+    """
+    def eventos():
+        ultimo = None
+        while True:
+            status = ler_status_job(thread_id)
+            if status is None:
+                yield f"event: error\ndata: {app.json.dumps({'error': 'Thread não encontrada'})}\n\n"
+                return
+            if status != ultimo:
+                yield f"data: {app.json.dumps(status)}\n\n"
+                ultimo = status
+            if status['status'] == 'completed':
+                return
+            
+            mudou = aguardar_job(thread_id, lambda: ler_status_job(thread_id) != ultimo, STATUS_WAIT_MAX)
+            if not mudou:
+                # Comentário SSE para manter a conexão viva em proxies
+                yield ": keepalive\n\n"
+    
+    return Response(eventos(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/download/<path:filename>')
 def download_file(filename):
     """Endpoint para download de arquivos gerados"""
     try:
-        file_path = os.path.join(app.config['OUTPUT_FOLDER'], filename)
+        with OUTPUT_INDEX_LOCK:
+            file_path = OUTPUT_INDEX.get(filename)
         
-        # Debug: log do caminho do arquivo
-        print(f"[DEBUG] Tentando baixar: {filename}")
-        print(f"[DEBUG] Caminho completo: {file_path}")
-        print(f"[DEBUG] Arquivo existe: {os.path.exists(file_path)}")
+        if file_path and not os.path.isfile(file_path):
+            # Entrada velha: removido fora da aplicação ou pelo /clear_cache de outro worker
+            with OUTPUT_INDEX_LOCK:
+                if OUTPUT_INDEX.get(filename) == file_path:
+                    del OUTPUT_INDEX[filename]
+            file_path = None
         
-        if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
-        else:
-            # Listar arquivos disponíveis para debug
-            available_files = []
-            if os.path.exists(app.config['OUTPUT_FOLDER']):
-                available_files = [f for f in os.listdir(app.config['OUTPUT_FOLDER']) if f.endswith('.csv')]
-            
-            print(f"[DEBUG] Arquivos disponíveis: {available_files}")
-            return jsonify({
-                'success': False, 
-                'error': f'Arquivo não encontrado: {filename}',
-                'available_files': available_files
-            })
+        if not file_path:
+            # Fora do índice: resolver o caminho e garantir que fica dentro da pasta de saída
+            resolvido = (OUTPUT_REAL / filename).resolve()
+            if OUTPUT_REAL not in resolvido.parents:
+                logger.warning("Caminho fora da pasta de saída recusado: %s", filename)
+                return jsonify({'success': False, 'error': f'Caminho inválido: {filename}'}), 403
+            if not resolvido.is_file():
+                return jsonify({'success': False, 'error': f'Arquivo não encontrado: {filename}'}), 404
+            file_path = str(resolvido)
+            registrar_saida(file_path)
+        
+        # Respostas condicionais (ETag/Last-Modified) permitem 304 sem reenviar o corpo;
+        # o send_file usa o wsgi.file_wrapper do servidor (sendfile) quando disponível
+        return send_file(
+            file_path,
+            as_attachment=True,
+            conditional=True,
+            etag=True
+        )
+    except FileNotFoundError:
+        # Removido entre a verificação e o envio
+        return jsonify({'success': False, 'error': f'Arquivo não encontrado: {filename}'}), 404
     except Exception as e:
-        print(f"[ERROR] Erro no download: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)})
+        logger.error("Erro no download: %s", e)
+        return jsonify({'success': False, 'error': str(e)}), 500
 
 @app.route('/download_all')
 def download_all():
     """Endpoint para download de todos os arquivos CSV em ZIP"""
     try:
-        # Criar arquivo ZIP temporário
-        temp_zip = tempfile.NamedTemporaryFile(delete=False, suffix='.zip')
-        
-        with zipfile.ZipFile(temp_zip.name, 'w') as zipf:
-            output_path = Path(app.config['OUTPUT_FOLDER'])
-            
-            # Adicionar todos os arquivos CSV
-            for file_path in output_path.rglob('*'):
-                if file_path.is_file() and file_path.suffix == '.csv':
-                    arcname = file_path.relative_to(output_path)
-                    zipf.write(file_path, arcname)
-        
-        return send_file(
-            temp_zip.name,
-            as_attachment=True,
-            download_name=f'ddl_converted_files_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip',
-            mimetype='application/zip'
-        )
-        
+        # Enumerar os CSVs numa única varredura (scandir)
+        arquivos = [
+            (nome, caminho) for nome, caminho in _varrer_saidas(app.config['OUTPUT_FOLDER'])
+            if nome.endswith('.csv')
+        ]
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
+    
+    def gerar_zip():
+        # O ZIP é montado enquanto é enviado: nada vai para disco e o primeiro byte sai logo
+        saida = SaidaZip()
+        # CSVs vão sem compressão (ZIP_STORED): o custo do deflate não compensa para o download
+        with zipfile.ZipFile(saida, 'w', zipfile.ZIP_STORED, allowZip64=True) as zipf:
+            for nome, caminho in arquivos:
+                try:
+                    zipf.write(caminho, nome)
+                except FileNotFoundError:
+                    # Removido entre a listagem e o envio (ex.: /clear_cache)
+                    continue
+                yield saida.esvaziar()
+        yield saida.esvaziar()
+    
+    nome_zip = f'ddl_converted_files_{datetime.now().strftime("%Y%m%d_%H%M%S")}.zip'
+    return Response(gerar_zip(), mimetype='application/zip',
+                    headers={'Content-Disposition': f'attachment; filename="{nome_zip}"'})
 
 @app.route('/compare', methods=['POST'])
 def compare_json_ddl():
@@ -331,19 +1202,33 @@ def compare_json_ddl():
         ddl_path = get_safe_path(app.config['UPLOAD_FOLDER'], ddl_filename)
         json_path = get_safe_path(app.config['UPLOAD_FOLDER'], json_filename)
         
-        print(f"[DEBUG] Salvando DDL em: {ddl_path}")
-        print(f"[DEBUG] Salvando JSON em: {json_path}")
-        
-        ddl_file.save(ddl_path)
-        json_file.save(json_path)
+        # DDL lido uma vez em memória; o hash decide se a extração pode ser reaproveitada
+        dados_ddl = ddl_file.stream.read(MAX_CONTENT_LENGTH)
+        h = novo_hash()
+        h.update(dados_ddl)
+        ddl_hash = h.hexdigest()
+        analise = analise_ddl_em_cache(ddl_hash)
         
-        print(f"[DEBUG] DDL salvo: {os.path.exists(ddl_path)}")
-        print(f"[DEBUG] JSON salvo: {os.path.exists(json_path)}")
+        # O mesmo JSON reenviado não é regravado: o mapeamento dele segue em cache no comparador
+        logger.debug("Salvando JSON em: %s", json_path)
+        gravado = gravar_se_mudou(json_file.stream.read(MAX_CONTENT_LENGTH), json_path)
+        logger.debug("JSON salvo: %s", gravado)
         
-        # Processar DDL
-        conteudo_ddl = ler_arquivo_ddl(ddl_path)
-        nome_tabela = extrair_nome_tabela(conteudo_ddl)
-        info_tabela = extrair_informacoes_tabela(conteudo_ddl, nome_tabela)
+        if analise:
+            logger.debug("DDL já analisado (cache): %s", ddl_hash)
+            nome_tabela, info_tabela = analise
+        else:
+            logger.debug("Salvando DDL em: %s", ddl_path)
+            with open(ddl_path, 'wb') as saida:
+                saida.write(dados_ddl)
+            logger.debug("DDL salvo: %s", os.path.exists(ddl_path))
+            
+            # Processar DDL
+            conteudo_ddl = ler_arquivo_ddl(ddl_path)
+            comandos = separar_comandos(conteudo_ddl)
+            nome_tabela = extrair_nome_tabela(conteudo_ddl, comandos)
+            info_tabela = extrair_informacoes_tabela(conteudo_ddl, nome_tabela, comandos)
+            guardar_analise_ddl(ddl_hash, nome_tabela, info_tabela)
         
         # Garantir que a chave 'descricao' existe no dicionário
         if 'descricao' not in info_tabela:
@@ -355,18 +1240,20 @@ def compare_json_ddl():
         
         # Comparar com JSON antigo
         csv_path = output_dir / f"{nome_tabela}_comparado.csv"
-        print(f"[DEBUG] Iniciando comparação...")
-        print(f"[DEBUG] DDL: {ddl_path}")
-        print(f"[DEBUG] JSON: {json_path}")
-        print(f"[DEBUG] CSV saída: {csv_path}")
-        print(f"[DEBUG] Info tabela: {info_tabela}")
+        logger.debug("Iniciando comparação...")
+        logger.debug("DDL: %s", ddl_path)
+        logger.debug("JSON: %s", json_path)
+        logger.debug("CSV saída: %s", csv_path)
+        logger.debug("Info tabela: %s", info_tabela)
         
-        resultado = processar_comparacao(ddl_path, json_path, info_tabela, str(csv_path))
+        resultado = processar_comparacao(ddl_path, json_path, info_tabela, str(csv_path), incluir_dados=True)
+        if resultado['sucesso']:
+            registrar_saida(csv_path)
         
-        print(f"[DEBUG] Resultado: {resultado['sucesso']}")
+        logger.debug("Resultado: %s", resultado['sucesso'])
         
         if resultado['sucesso']:
-            print(f"[DEBUG] Retornando dados CSV: {len(resultado['dados_csv'])} linhas")
+            logger.debug("Retornando dados CSV: %s linhas", len(resultado['dados_csv']))
             return jsonify({
                 'success': True,
                 'nome_tabela': resultado['nome_tabela'],
@@ -376,11 +1263,11 @@ def compare_json_ddl():
                 'dados_csv': resultado['dados_csv']
             })
         else:
-            print(f"[DEBUG] Erro: {resultado['erro']}")
+            logger.debug("Erro: %s", resultado['erro'])
             return jsonify({'success': False, 'error': resultado['erro']})
         
     except Exception as e:
-        print(f"[ERROR] Exceção: {str(e)}")
+        logger.error("Exceção: %s", e)
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)})
@@ -390,35 +1277,36 @@ def salvar_csv_json():
     """
     Endpoint para salvar CSV editado e gerar JSON
     
-    Recebe os dados do CSV, salva em um arquivo temporário e gera o JSON final.
+    Recebe os dados do CSV e gera o JSON final direto das linhas, sem arquivo temporário.
     Retorna o caminho do arquivo JSON gerado ou uma mensagem de erro.
     """
-    print("\n[DEBUG] Iniciando processamento de salvar_csv_json")
+    logger.debug("Iniciando processamento de salvar_csv_json")
     
     try:
         # Validar dados de entrada
         data = request.get_json()
-        print(f"[DEBUG] Dados recebidos: {json.dumps(data, indent=2)[:500]}...")  # Limita o tamanho do log
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Dados recebidos: %s...", json.dumps(data, indent=2)[:500])  # Limita o tamanho do log
         
         if not data or 'dados_csv' not in data or 'nome_tabela' not in data:
             error_msg = 'Dados inválidos. É necessário fornecer dados_csv e nome_tabela.'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 400
             
         dados_csv = data['dados_csv']
         nome_tabela = data['nome_tabela'].strip()
         
-        print(f"[DEBUG] Nome da tabela: {nome_tabela}")
-        print(f"[DEBUG] Quantidade de linhas CSV: {len(dados_csv) if dados_csv else 0}")
+        logger.debug("Nome da tabela: %s", nome_tabela)
+        logger.debug("Quantidade de linhas CSV: %s", len(dados_csv) if dados_csv else 0)
         
         if not dados_csv or not isinstance(dados_csv, list):
             error_msg = 'Dados do CSV inválidos ou vazios.'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 400
             
         if not nome_tabela:
             error_msg = 'Nome da tabela não fornecido.'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 400
         
         # Garantir que o diretório de saída existe e tem permissão
@@ -431,80 +1319,62 @@ def salvar_csv_json():
             test_file.unlink()
         except Exception as e:
             error_msg = f'Erro ao acessar o diretório de saída {output_dir}: {str(e)}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 500
         
-        print(f"[DEBUG] Diretório de saída: {output_dir}")
-        print(f"[DEBUG] Permissão de escrita: {'sim' if os.access(str(output_dir), os.W_OK) else 'não'}")
+        logger.debug("Diretório de saída: %s", output_dir)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Permissão de escrita: %s", 'sim' if os.access(str(output_dir), os.W_OK) else 'não')
         
-        # Nome do arquivo de saída
+        # Nome do arquivo de saída (sufixo aleatório: dois salvamentos no mesmo segundo não se sobrescrevem)
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        nome_arquivo = f"{nome_tabela}_{timestamp}.json"
+        nome_arquivo = f"{nome_tabela}_{timestamp}_{secrets.token_hex(4)}.json"
         caminho_json = output_dir / nome_arquivo
         
-        print(f"[DEBUG] Caminho do JSON de saída: {caminho_json}")
-        
-        # Salvar CSV temporário
-        temp_csv = output_dir / f"temp_{timestamp}.csv"
-        print(f"[DEBUG] Salvando CSV temporário em: {temp_csv}")
+        logger.debug("Caminho do JSON de saída: %s", caminho_json)
         
+        # Gerar JSON direto das linhas recebidas (sem CSV temporário em disco)
         try:
-            with open(temp_csv, 'w', newline='', encoding='utf-8') as f:
-                if dados_csv:
-                    # Escrever cabeçalhos com delimitador ';'
-                    writer = csv.DictWriter(f, fieldnames=dados_csv[0].keys(), delimiter=';')
-                    writer.writeheader()
-                    # Escrever dados
-                    writer.writerows(dados_csv)
-                    print(f"[DEBUG] CSV temporário salvo com sucesso: {temp_csv}")
-        except Exception as e:
-            error_msg = f'Erro ao salvar CSV temporário: {str(e)}'
-            print(f"[ERRO] {error_msg}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({'success': False, 'error': error_msg}), 500
-            
-        # Gerar JSON a partir do CSV
-        try:
-            print("[DEBUG] Procurando arquivo JSON antigo...")
+            logger.debug("Procurando arquivo JSON antigo...")
             
             # Encontrar o arquivo JSON antigo
             json_antigo = None
             upload_dir = Path(app.config['UPLOAD_FOLDER']).resolve()
             
-            print(f"[DEBUG] Procurando JSON em: {upload_dir}")
+            logger.debug("Procurando JSON em: %s", upload_dir)
             
             # Listar arquivos JSON no diretório de upload
-            json_files = list(upload_dir.glob('*.json'))
-            print(f"[DEBUG] Arquivos JSON encontrados: {[f.name for f in json_files]}")
+            json_files = listar_arquivos(upload_dir, '.json')
+            logger.debug("Arquivos JSON encontrados: %s", json_files)
             
             if json_files:
-                json_antigo = str(json_files[0])
-                print(f"[DEBUG] Usando JSON antigo: {json_antigo}")
+                json_antigo = str(upload_dir / json_files[0])
+                logger.debug("Usando JSON antigo: %s", json_antigo)
             else:
-                print("[DEBUG] Nenhum arquivo JSON antigo encontrado")
+                logger.debug("Nenhum arquivo JSON antigo encontrado")
             
-            # Processar CSV para JSON
-            print("[DEBUG] Iniciando processamento do CSV para JSON...")
+            # Processar linhas para JSON
+            logger.debug("Iniciando processamento das linhas para JSON...")
             
             # Importar a função de geração de JSON
-            from json_generator import processar_csv_para_json
+            from json_generator import processar_linhas_para_json
             
-            # Chamar a função para processar o CSV e gerar o JSON
-            print(f"[DEBUG] Chamando processar_csv_para_json com: {temp_csv}, {nome_tabela}, {caminho_json}, {json_antigo}")
+            # Chamar a função para processar as linhas e gerar o JSON
+            logger.debug("Chamando processar_linhas_para_json com: %s, %s, %s", nome_tabela, caminho_json, json_antigo)
             
-            resultado_json = processar_csv_para_json(
-                str(temp_csv),
+            resultado_json = processar_linhas_para_json(
+                dados_csv,
+                nome_tabela,
                 str(caminho_json),
                 json_antigo
             )
             
-            print(f"[DEBUG] Resultado da geração do JSON: {resultado_json}")
+            logger.debug("Resultado da geração do JSON: %s", resultado_json)
             
             # Verificar se o processamento foi bem-sucedido (usando a chave 'sucesso' em vez de 'success')
             if not resultado_json.get('sucesso', False):
                 error_msg = resultado_json.get('erro', 'Erro desconhecido ao processar o JSON')
-                print(f"[ERRO] {error_msg}")
+                logger.error("%s", error_msg)
                 return jsonify({
                     'success': False,
                     'error': error_msg
@@ -513,32 +1383,33 @@ def salvar_csv_json():
             # Verificar se o arquivo foi criado
             if not caminho_json.exists():
                 error_msg = f'Erro: O arquivo JSON não foi gerado em {caminho_json}'
-                print(f"[ERRO] {error_msg}")
+                logger.error("%s", error_msg)
                 
                 # Tentar listar o diretório para debug
                 try:
-                    files = list(output_dir.glob('*'))
-                    print(f"[DEBUG] Conteúdo do diretório {output_dir}: {[f.name for f in files]}")
+                    files = listar_arquivos(output_dir)
+                    logger.debug("Conteúdo do diretório %s: %s", output_dir, files)
                 except Exception as e:
-                    print(f"[DEBUG] Não foi possível listar o diretório: {str(e)}")
+                    logger.debug("Não foi possível listar o diretório: %s", e)
                 
                 return jsonify({
                     'success': False,
                     'error': error_msg,
-                    'available_files': [f.name for f in files] if 'files' in locals() else []
+                    'available_files': files if 'files' in locals() else []
                 }), 500
             
             # Verificar se o arquivo tem conteúdo
             file_size = caminho_json.stat().st_size
             if file_size == 0:
                 error_msg = f'Erro: O arquivo JSON está vazio: {caminho_json}'
-                print(f"[ERRO] {error_msg}")
+                logger.error("%s", error_msg)
                 return jsonify({
                     'success': False,
                     'error': error_msg
                 }), 500
             
-            print(f"[SUCESSO] JSON gerado com sucesso em: {caminho_json} (tamanho: {file_size} bytes)")
+            logger.info("JSON gerado com sucesso em: %s (tamanho: %s bytes)", caminho_json, file_size)
+            registrar_saida(caminho_json)
             
             # Retornar sucesso
             response_data = {
@@ -549,13 +1420,14 @@ def salvar_csv_json():
                 'file_path': str(caminho_json)
             }
             
-            print(f"[DEBUG] Resposta de sucesso: {json.dumps(response_data, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Resposta de sucesso: %s", json.dumps(response_data, indent=2))
             
             return jsonify(response_data)
             
         except Exception as e:
             error_msg = f'Erro ao processar o CSV: {str(e)}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             import traceback
             traceback.print_exc()
             
@@ -564,19 +1436,10 @@ def salvar_csv_json():
                 'error': error_msg,
                 'traceback': str(traceback.format_exc())
             }), 500
-            
-        finally:
-            # Remover CSV temporário
-            try:
-                if temp_csv.exists():
-                    temp_csv.unlink()
-                    print(f"[DEBUG] Arquivo temporário removido: {temp_csv}")
-            except Exception as e:
-                print(f"[AVISO] Não foi possível remover o arquivo temporário {temp_csv}: {str(e)}")
-            
+
     except Exception as e:
         error_msg = f'Erro inesperado: {str(e)}'
-        print(f"[ERRO] {error_msg}")
+        logger.error("%s", error_msg)
         import traceback
         traceback.print_exc()
         
@@ -593,112 +1456,102 @@ def download_json(filename):
     
     Verifica se o arquivo existe no diretório de saída e o envia como anexo.
     """
-    print(f"\n[DEBUG] Iniciando download do arquivo: {filename}")
+    logger.debug("Iniciando download do arquivo: %s", filename)
     
     try:
         # Garantir que o nome do arquivo seja seguro
         if not filename or not isinstance(filename, str) or '..' in filename or filename.startswith('/'):
             error_msg = f'Nome de arquivo inválido: {filename}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 400
             
         # Construir o caminho completo do arquivo de forma segura
         output_dir = Path(app.config['OUTPUT_FOLDER']).resolve()
         file_path = output_dir / Path(filename).name  # Usar apenas o nome do arquivo, ignorando qualquer caminho
         
-        print(f"[DEBUG] Procurando arquivo em: {file_path}")
+        logger.debug("Procurando arquivo em: %s", file_path)
         
         # Verificar se o diretório de saída existe
         if not output_dir.exists():
             error_msg = f'Diretório de saída não encontrado: {output_dir}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 404
             
-        print(f"[DEBUG] Diretório de saída existe: {output_dir}")
-        
-        # Listar arquivos no diretório para debug
-        try:
-            available_files = [f.name for f in output_dir.glob('*') if f.is_file()]
-            print(f"[DEBUG] Arquivos disponíveis em {output_dir}: {available_files}")
-        except Exception as e:
-            print(f"[AVISO] Não foi possível listar arquivos em {output_dir}: {str(e)}")
+        logger.debug("Diretório de saída existe: %s", output_dir)
         
         # Verificar se o arquivo existe
         if not file_path.exists():
             error_msg = f'Arquivo não encontrado: {file_path}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
+            
+            # Listar arquivos no diretório para debug (só quando o arquivo não existe)
+            try:
+                available_files = listar_arquivos(output_dir)
+                logger.debug("Arquivos disponíveis em %s: %s", output_dir, available_files)
+            except Exception as e:
+                logger.warning("Não foi possível listar arquivos em %s: %s", output_dir, e)
             return jsonify({
                 'success': False, 
                 'error': error_msg,
                 'available_files': available_files if 'available_files' in locals() else []
             }), 404
             
-        print(f"[DEBUG] Arquivo encontrado: {file_path} (tamanho: {file_path.stat().st_size} bytes)")
+        logger.debug("Arquivo encontrado: %s", file_path)
             
         # Verificar se é um arquivo
         if not file_path.is_file():
             error_msg = f'O caminho especificado não é um arquivo: {file_path}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 400
             
         # Verificar permissões de leitura
         if not os.access(str(file_path), os.R_OK):
             error_msg = f'Permissão negada para ler o arquivo: {file_path}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 403
         
         # Verificar se o arquivo está vazio
-        if file_path.stat().st_size == 0:
+        tamanho = file_path.stat().st_size
+        if tamanho == 0:
             error_msg = f'O arquivo está vazio: {file_path}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             return jsonify({'success': False, 'error': error_msg}), 400
             
-        print(f"[DEBUG] Enviando arquivo: {file_path} (tamanho: {file_path.stat().st_size} bytes)")
+        logger.debug("Enviando arquivo: %s (tamanho: %s bytes)", file_path, tamanho)
         
         # Forçar o download como anexo
         try:
-            from flask import send_file, Response
-            import mimetypes
-            
             # Garantir que o caminho é seguro e absoluto
             safe_path = (output_dir / filename).resolve()
             if not safe_path.exists():
                 return jsonify({'success': False, 'error': 'Arquivo não encontrado'}), 404
                 
-            print(f"[DEBUG] Enviando arquivo seguro: {safe_path}")
-            
-            # Determinar o tipo MIME
-            mimetype = 'application/json'
-            
-            # Ler o conteúdo do arquivo
-            with open(safe_path, 'rb') as f:
-                file_content = f.read()
-            
-            # Criar resposta com o conteúdo do arquivo
-            response = Response(
-                file_content,
-                mimetype=mimetype,
-                headers={
-                    'Content-Disposition': f'attachment; filename="{filename}"',
-                    'Cache-Control': 'no-cache, no-store, must-revalidate',
-                    'Pragma': 'no-cache',
-                    'Expires': '0'
-                }
+            logger.debug("Enviando arquivo seguro: %s", safe_path)
+            
+            # send_file entrega o arquivo pelo wsgi.file_wrapper (sem ler tudo para a memória)
+            # e responde requisições condicionais/Range; no-cache força revalidar a cada download
+            response = send_file(
+                safe_path,
+                mimetype='application/json',
+                as_attachment=True,
+                download_name=filename,
+                conditional=True
             )
+            response.headers['Cache-Control'] = 'no-cache'
             
-            print(f"[SUCESSO] Arquivo enviado com sucesso: {filename}")
+            logger.info("Arquivo enviado com sucesso: %s", filename)
             return response
             
         except Exception as e:
             error_msg = f'Erro ao enviar o arquivo: {str(e)}'
-            print(f"[ERRO] {error_msg}")
+            logger.error("%s", error_msg)
             import traceback
             traceback.print_exc()
             return jsonify({'success': False, 'error': error_msg}), 500
         
     except Exception as e:
         error_msg = f'Erro inesperado ao processar o download: {str(e)}'
-        print(f"[ERRO] {error_msg}")
+        logger.error("%s", error_msg)
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': error_msg}), 500
@@ -712,11 +1565,22 @@ def clear_cache():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/clear_hashdb', methods=['POST'])
+def clear_hashdb():
+    """Endpoint para esquecer os hashes de arquivos já processados"""
+    try:
+        limpar_hashdb()
+        return jsonify({'success': True, 'message': 'Base de hashes limpa com sucesso'})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
 # Inicialização da aplicação
 def init_app():
     """Inicializa a aplicação"""
     # Criar diretórios necessários
     setup_directories()
+    indexar_saidas()
+    retomar_jobs()
     
     print("\n=== DDL Converter Web Application ===")
     print("Diretórios configurados:")
@@ -724,17 +1588,31 @@ def init_app():
     print(f"- Saída: {app.config['OUTPUT_FOLDER']}")
     print("\nAcesse: http://localhost:5000")
 
-def open_browser():
-    """Abre o navegador automaticamente após 1.5 segundos"""
-    time.sleep(1.5)
-    webbrowser.open_new('http://localhost:5000')
+def open_browser(host='localhost', port=5000, timeout=15):
+    """Abre o navegador assim que o servidor aceitar conexões"""
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+        except OSError:
+            time.sleep(0.05)
+            continue
+        webbrowser.open_new(f'http://{host}:{port}')
+        return
+    logger.warning("Servidor não respondeu em %ss; abra http://%s:%s manualmente", timeout, host, port)
 
 if __name__ == '__main__':
     # Inicializar a aplicação
     init_app()
     
-    # Iniciar o navegador em uma thread separada
-    threading.Thread(target=open_browser).start()
+    # Iniciar o navegador em uma thread separada (só no processo principal, não no filho do reloader)
+    if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        threading.Thread(target=open_browser, daemon=True).start()
     
-    # Iniciar o servidor Flask
-    app.run(debug=True, use_reloader=False, port=5000)
+    # Iniciar o servidor Flask; o debugger interativo executa código enviado pelo
+    # navegador, então só é ligado com DEV=1
+    dev = os.environ.get('DEV') == '1'
+    if not dev:
+        print("Servidor de desenvolvimento sem debugger (DEV=1 para ativá-lo); "
+              "em produção use wsgi.py com gunicorn")
+    app.run(debug=dev, use_reloader=False, port=5000)
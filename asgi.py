@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ponto de entrada ASGI
+=====================
+
+Expõe a aplicação Flask para servidores ASGI (Uvicorn, Hypercorn). O laço
+de eventos do servidor multiplexa as conexões; cada requisição roda no pool
+de threads do adaptador e o parsing dos DDLs continua no pool de processos
+da aplicação.
+
+init_app() roda em cada worker: os jobs interrompidos são reivindicados na
+base de estado, então cada um é retomado por apenas um deles.
+
+Uso:
+    pip install -r requirements.txt uvicorn  # asgiref está no requirements.txt
+    uvicorn asgi:app --workers 4
+
+Autor: Felipe Machado
+"""
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app as flask_app, init_app
+
+init_app()
+
+app = WsgiToAsgi(flask_app)
@@ -18,8 +18,39 @@ Autor: Felipe Machado
 
 import json
 import csv
+import functools
+import itertools
+import os
+import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Any, Mapping, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Opcional: sem orjson o JSON antigo é lido com o json da stdlib
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Opcional: sem ijson o JSON antigo é sempre carregado inteiro
+    ijson = None
+
+# Colunas do CSV comparado, na ordem das tuplas geradas por comparar_e_mesclar
+CAMPOS_CSV = ('tabela', 'descricao_mf', 'coluna_mf', 'rename_to',
+              'descricao_coluna_mf', 'descricao_oficial', 'tipo_original')
+
+# Buffer da escrita do CSV comparado: poucas chamadas write() mesmo em tabelas grandes
+CSV_BUFFER_SIZE = 1024 * 1024
+CSV_LINHAS_POR_BLOCO = 1000  # Linhas montadas por join antes de cada write()
+_METADATA_VAZIO = {}  # Campos do JSON antigo sem 'metadata'
+_TIPO_PADRAO = sys.intern('string')  # inputType/outputType ausentes
+
+# Acima deste tamanho (com ijson instalado) o mapeamento é extraído do JSON antigo em streaming;
+# ijson e orjson são dependências opcionais, listadas no requirements.txt
+JSON_STREAM_MIN_SIZE = 10 * 1024 * 1024
+_CARACTERES_ESCAPE_CSV = re.compile(r'["\r\n]')  # Exigem aspas no CSV (o ';' é checado pela contagem)
 
 
 def ler_json_antigo(caminho_json: str) -> Dict[str, Any]:
@@ -39,42 +70,140 @@ def ler_json_antigo(caminho_json: str) -> Dict[str, Any]:
     if not Path(caminho_json).exists():
         raise FileNotFoundError(f"Arquivo JSON não encontrado: {caminho_json}")
     
+    # Ler os bytes de uma vez e decodificar direto, sem o caminho de texto do json.load
+    conteudo = Path(caminho_json).read_bytes()
     try:
-        with open(caminho_json, 'r', encoding='utf-8') as arquivo:
-            dados = json.load(arquivo)
-    except json.JSONDecodeError as e:
+        dados = orjson.loads(conteudo) if orjson is not None else json.loads(conteudo.decode('utf-8'))
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError é subclasse desta
         raise ValueError(f"JSON inválido: {str(e)}")
     
     return dados
 
 
-def extrair_mapeamento_json(dados_json: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+def extrair_mapeamento_json(dados_json: Dict[str, Any]) -> Dict[str, Tuple[str, str, str, str]]:
     """
     Extrai mapeamento de colunas do JSON antigo.
+    Formato esperado: {tabela: {'structure': {'fields': [campo, ...]}}}; valores de
+    topo fora desse formato são ignorados.
     
     Args:
         dados_json: Dados do JSON antigo
         
     Returns:
-        Dicionário mapeando coluna_mf → {rename_to, description, inputType}
+        Dicionário mapeando coluna_mf → (rename_to, description, inputType, outputType)
+        
+    Raises:
+        ValueError: Se o topo do JSON ou algum campo não for um objeto, ou se
+            structure.fields não for uma lista
+    """
+    if not isinstance(dados_json, dict):
+        raise ValueError(f"JSON antigo inválido: esperado objeto no topo, recebido {type(dados_json).__name__}")
+    
+    mapeamento = {}
+    
+    # Navegar pela estrutura do JSON: o caso comum (tabela com structure.fields) vai direto;
+    # chaves ausentes ou valores que não são objetos caem no except
+    for tabela_info in dados_json.values():
+        try:
+            campos = tabela_info['structure']['fields']
+        except (KeyError, TypeError):
+            continue
+        if campos is None:
+            continue
+        if not isinstance(campos, list):
+            raise ValueError(f"JSON antigo inválido: structure.fields deve ser uma lista, recebido {type(campos).__name__}")
+        for campo in campos:
+            mapeamento[campo.get('name', '')] = _mapear_campo(campo)
+    
+    return mapeamento
+
+
+def _mapear_campo(campo: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """
+    Converte um campo do JSON antigo na tupla usada pelo mapeamento.
+    
+    Args:
+        campo: Campo de structure.fields
+        
+    Returns:
+        Tupla (rename_to, description, inputType, outputType)
+        
+    Raises:
+        ValueError: Se o campo ou seu metadata não for um objeto
+    """
+    try:
+        metadata_get = (campo.get('metadata') or _METADATA_VAZIO).get
+    except AttributeError:
+        raise ValueError(f"JSON antigo inválido: campo e metadata de structure.fields devem ser objetos: {str(campo)[:80]}")
+    return (
+        metadata_get('renameTo', ''),
+        metadata_get('description', ''),
+        _internar(metadata_get('inputType', _TIPO_PADRAO)),
+        _internar(metadata_get('outputType', _TIPO_PADRAO))
+    )
+
+
+def _internar(valor: Any) -> Any:
+    """
+    Interna os nomes de tipo (poucos valores distintos repetidos em todos os campos),
+    para que as linhas compartilhem o mesmo objeto em vez de uma cópia por campo.
+    """
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+def extrair_mapeamento_json_stream(caminho_json: str) -> Dict[str, Tuple[str, str, str, str]]:
+    """
+    Extrai o mapeamento de colunas lendo o JSON antigo em streaming (ijson).
+    Só um campo por vez é montado em memória; o resultado é o mesmo de
+    extrair_mapeamento_json(ler_json_antigo(caminho_json)).
+    
+    Args:
+        caminho_json: Caminho do arquivo JSON antigo
+        
+    Returns:
+        Dicionário mapeando coluna_mf → (rename_to, description, inputType, outputType)
+        
+    Raises:
+        ValueError: Se o JSON for inválido, nas mesmas condições de extrair_mapeamento_json
     """
     mapeamento = {}
     
-    # Navegar pela estrutura do JSON
-    for tabela_nome, tabela_info in dados_json.items():
-        if isinstance(tabela_info, dict) and 'structure' in tabela_info:
-            estrutura = tabela_info['structure']
-            if 'fields' in estrutura:
-                for campo in estrutura['fields']:
-                    nome_original = campo.get('name', '')
-                    metadata = campo.get('metadata', {})
-                    
-                    mapeamento[nome_original] = {
-                        'rename_to': metadata.get('renameTo', ''),
-                        'description': metadata.get('description', ''),
-                        'inputType': metadata.get('inputType', 'string'),
-                        'outputType': metadata.get('outputType', 'string')
-                    }
+    try:
+        with open(caminho_json, 'rb') as arquivo:
+            eventos = ijson.parse(arquivo, use_float=True)
+            _, evento, _ = next(eventos)
+            if evento != 'start_map':
+                raise ValueError("JSON antigo inválido: esperado objeto no topo")
+            profundidade = 1
+            for prefixo, evento, valor in eventos:
+                if profundidade == 3 and prefixo.endswith('.structure.fields'):
+                    # <tabela>.structure.fields: a lista de campos (ou null)
+                    if evento not in ('start_array', 'null'):
+                        raise ValueError("JSON antigo inválido: structure.fields deve ser uma lista")
+                elif profundidade == 4 and prefixo.endswith('.structure.fields.item'):
+                    # <tabela>.structure.fields.item: um campo da estrutura
+                    if evento != 'start_map':
+                        raise ValueError("JSON antigo inválido: campo de structure.fields não é um objeto")
+                    construtor = ijson.ObjectBuilder()
+                    construtor.event(evento, valor)
+                    aninhamento = 1
+                    for _, evento, valor in eventos:
+                        construtor.event(evento, valor)
+                        if evento in ('start_map', 'start_array'):
+                            aninhamento += 1
+                        elif evento in ('end_map', 'end_array'):
+                            aninhamento -= 1
+                            if aninhamento == 0:
+                                break
+                    campo = construtor.value
+                    mapeamento[campo.get('name', '')] = _mapear_campo(campo)
+                    continue
+                if evento in ('start_map', 'start_array'):
+                    profundidade += 1
+                elif evento in ('end_map', 'end_array'):
+                    profundidade -= 1
+    except ijson.JSONError as e:
+        raise ValueError(f"JSON inválido: {str(e)}")
     
     return mapeamento
 
@@ -101,99 +230,161 @@ def extrair_colunas_ddl(info_tabela: Dict[str, Any]) -> List[Dict[str, str]]:
     return colunas
 
 
+def carregar_mapeamento_json(caminho_json: str) -> Mapping[str, Tuple[str, str, str, str]]:
+    """
+    Retorna o mapeamento de colunas do JSON antigo, com cache por arquivo.
+    Comparar vários DDLs com o mesmo JSON lê e interpreta o arquivo uma única vez;
+    qualquer alteração (mtime ou tamanho) invalida a entrada.
+    
+    Args:
+        caminho_json: Caminho do arquivo JSON antigo
+        
+    Returns:
+        Mapeamento somente leitura coluna_mf → (rename_to, description, inputType, outputType)
+        
+    Raises:
+        FileNotFoundError: Se o arquivo não existir
+        ValueError: Se o JSON for inválido
+    """
+    try:
+        stat = os.stat(caminho_json)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Arquivo JSON não encontrado: {caminho_json}")
+    return _mapeamento_em_cache(os.path.abspath(caminho_json), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _mapeamento_em_cache(caminho_json: str, mtime_ns: int, tamanho: int) -> Mapping[str, Tuple[str, str, str, str]]:
+    """
+    Lê e extrai o mapeamento do JSON antigo (em streaming quando ele é grande).
+    mtime_ns e tamanho só compõem a chave do cache.
+    """
+    if ijson is not None and tamanho > JSON_STREAM_MIN_SIZE:
+        mapeamento = extrair_mapeamento_json_stream(caminho_json)
+    else:
+        mapeamento = extrair_mapeamento_json(ler_json_antigo(caminho_json))
+    # Somente leitura: o mesmo objeto é compartilhado entre as comparações
+    return MappingProxyType(mapeamento)
+
+
 def comparar_e_mesclar(colunas_ddl: List[Dict[str, str]], 
-                       mapeamento_json: Dict[str, Dict[str, str]],
+                       mapeamento_json: Mapping[str, Tuple[str, str, str, str]],
                        nome_tabela: str,
-                       descricao_tabela: str) -> List[Dict[str, str]]:
+                       descricao_tabela: str,
+                       contagem: Optional[Dict[str, int]] = None) -> Iterator[Tuple[str, ...]]:
     """
     Compara colunas do DDL com mapeamento do JSON antigo.
+    As linhas são geradas sob demanda, para serem gravadas sem montar a lista inteira.
     
     Args:
         colunas_ddl: Colunas extraídas do DDL novo
         mapeamento_json: Mapeamento do JSON antigo
         nome_tabela: Nome da tabela
         descricao_tabela: Descrição da tabela
+        contagem: Dicionário opcional que recebe, ao fim da geração, 'existentes'
+            (linhas com rename_to preenchido) e 'novas' (linhas sem rename_to)
         
-    Returns:
-        Lista de dicionários para o CSV
+    Yields:
+        Linhas do CSV como tuplas, na ordem de CAMPOS_CSV
     """
-    resultado = []
+    existentes = 0
+    total = len(colunas_ddl)
+    buscar_mapeamento = mapeamento_json.get
     
-    # Adicionar colunas do DDL
+    # Adicionar colunas do DDL numa única passada
     for coluna in colunas_ddl:
         nome_coluna = coluna['nome']
-        tipo_coluna = coluna['tipo']
-        
-        # Verificar se a coluna existe no JSON antigo
-        if nome_coluna in mapeamento_json:
-            # Se existe, usar os dados do JSON
-            mapeamento = mapeamento_json[nome_coluna]
-            resultado.append({
-                'tabela': nome_tabela,
-                'descricao_mf': descricao_tabela,
-                'coluna_mf': nome_coluna,
-                'rename_to': mapeamento.get('rename_to', ''),
-                'descricao_coluna_mf': mapeamento.get('description', ''),
-                'descricao_oficial': mapeamento.get('description', ''),
-                'tipo_original': tipo_coluna  # Garantir que está usando o tipo do DDL
-            })
+        # Se existe no JSON antigo, usar os dados do JSON; senão, entra como nova coluna
+        mapeamento = buscar_mapeamento(nome_coluna)
+        if mapeamento is not None:
+            rename_to, descricao = mapeamento[0], mapeamento[1]
+            if rename_to:
+                existentes += 1
         else:
-            # Se não existe, adicionar como nova coluna
-            resultado.append({
-                'tabela': nome_tabela,
-                'descricao_mf': descricao_tabela,
-                'coluna_mf': nome_coluna,
-                'rename_to': '',
-                'descricao_coluna_mf': '',
-                'descricao_oficial': '',
-                'tipo_original': tipo_coluna  # Garantir que está usando o tipo do DDL
-            })
-    
-    # Adicionar colunas que existem no JSON antigo mas não no DDL novo (para referência)
+            rename_to = descricao = ''
+        yield (
+            nome_tabela,
+            descricao_tabela,
+            nome_coluna,
+            rename_to,
+            descricao,
+            descricao,
+            coluna['tipo']  # Garantir que está usando o tipo do DDL
+        )
+    
+    # Adicionar colunas que existem no JSON antigo mas não no DDL novo (para referência),
+    # na ordem do JSON
     colunas_ddl_nomes = {c['nome'] for c in colunas_ddl}
-    for nome_coluna_antiga in mapeamento_json.keys():
-        if nome_coluna_antiga not in colunas_ddl_nomes:
+    if not mapeamento_json.keys() <= colunas_ddl_nomes:
+        descricao_removida = descricao_tabela + ' [REMOVIDA DO DDL]'
+        for nome_coluna_antiga, (rename_to, descricao, tipo_entrada, _) in mapeamento_json.items():
+            if nome_coluna_antiga in colunas_ddl_nomes:
+                continue
             # Coluna removida do DDL - adicionar com aviso
-            dados_antigos = mapeamento_json[nome_coluna_antiga]
-            linha = {
-                'tabela': nome_tabela,
-                'descricao_mf': descricao_tabela + ' [REMOVIDA DO DDL]',
-                'coluna_mf': nome_coluna_antiga + ' [REMOVIDA]',
-                'rename_to': dados_antigos.get('rename_to', ''),
-                'descricao_coluna_mf': '[COLUNA REMOVIDA]',
-                'descricao_oficial': dados_antigos.get('description', ''),
-                'tipo_original': dados_antigos.get('inputType', 'string')  # Tipo original do JSON
-            }
-            resultado.append(linha)
-    
-    return resultado
-
-
-def gerar_csv_comparado(dados_csv: List[Dict[str, str]], 
+            total += 1
+            if rename_to:
+                existentes += 1
+            yield (
+                nome_tabela,
+                descricao_removida,
+                nome_coluna_antiga + ' [REMOVIDA]',
+                rename_to,
+                '[COLUNA REMOVIDA]',
+                descricao,
+                tipo_entrada  # Tipo original do JSON
+            )
+    
+    if contagem is not None:
+        contagem['existentes'] = existentes
+        contagem['novas'] = total - existentes
+
+
+def gerar_csv_comparado(dados_csv: Iterable[Tuple[str, ...]], 
                        caminho_saida: str) -> None:
     """
     Gera arquivo CSV com dados comparados.
     
     Args:
-        dados_csv: Dados para o CSV
+        dados_csv: Linhas do CSV como tuplas, na ordem de CAMPOS_CSV (lista ou
+            iterador, consumido em lotes de CSV_LINHAS_POR_BLOCO)
         caminho_saida: Caminho onde salvar o arquivo
     """
-    if not dados_csv:
+    linhas = iter(dados_csv)
+    primeira = next(linhas, None)
+    if primeira is None:
         raise ValueError("Nenhum dado para gerar CSV")
+    linhas = itertools.chain((primeira,), linhas)
     
     Path(caminho_saida).parent.mkdir(parents=True, exist_ok=True)
     
-    with open(caminho_saida, 'w', newline='', encoding='utf-8') as arquivo:
-        campos = dados_csv[0].keys()
-        writer = csv.DictWriter(arquivo, fieldnames=campos, delimiter=';')
-        writer.writeheader()
-        writer.writerows(dados_csv)
+    separadores = len(CAMPOS_CSV) - 1
+    with open(caminho_saida, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as arquivo:
+        writer = csv.writer(arquivo, delimiter=';')
+        writer.writerow(CAMPOS_CSV)
+        
+        # Linhas só com texto "seguro" (sem ;, aspas ou quebras) saem por join direto, em blocos;
+        # as demais passam pelo csv.writer, que aplica aspas e escapes
+        while (lote := list(itertools.islice(linhas, CSV_LINHAS_POR_BLOCO))):
+            bloco = []
+            for valores in lote:
+                try:
+                    linha = ';'.join(valores)
+                except TypeError:  # Valores não textuais (None, números) ficam com o csv.writer
+                    linha = None
+                if linha is None or linha.count(';') != separadores or _CARACTERES_ESCAPE_CSV.search(linha):
+                    arquivo.write(''.join(bloco))
+                    bloco.clear()
+                    writer.writerow(valores)
+                    continue
+                bloco.append(linha + '\r\n')
+            arquivo.write(''.join(bloco))
 
 
 def processar_comparacao(caminho_ddl: str, 
                         caminho_json_antigo: str,
                         info_tabela: Dict[str, Any],
-                        caminho_csv_saida: str) -> Dict[str, Any]:
+                        caminho_csv_saida: str,
+                        incluir_dados: bool = False) -> Dict[str, Any]:
     """
     Processa comparação entre DDL novo e JSON antigo.
     
@@ -202,16 +393,15 @@ def processar_comparacao(caminho_ddl: str,
         caminho_json_antigo: Caminho do JSON antigo
         info_tabela: Informações da tabela extraídas do DDL
         caminho_csv_saida: Caminho onde salvar o CSV
+        incluir_dados: Se True, devolve também as linhas em 'dados_csv'; senão as
+            linhas vão direto para o CSV sem ficar em memória e 'dados_csv' é None
         
     Returns:
         Dicionário com informações do processamento
     """
     try:
-        # Ler JSON antigo
-        dados_json = ler_json_antigo(caminho_json_antigo)
-        
-        # Extrair mapeamento do JSON antigo
-        mapeamento_json = extrair_mapeamento_json(dados_json)
+        # Extrair mapeamento do JSON antigo (reaproveitado enquanto o arquivo não mudar)
+        mapeamento_json = carregar_mapeamento_json(caminho_json_antigo)
         
         # Extrair colunas do DDL
         colunas_ddl = extrair_colunas_ddl(info_tabela)
@@ -220,24 +410,19 @@ def processar_comparacao(caminho_ddl: str,
         nome_tabela = info_tabela['nome']
         descricao_tabela = info_tabela['descricao']
         
-        dados_csv = comparar_e_mesclar(colunas_ddl, mapeamento_json, 
-                                       nome_tabela, descricao_tabela)
+        # As linhas só viram lista quando também voltam no resultado
+        contagem = {}
+        linhas = comparar_e_mesclar(colunas_ddl, mapeamento_json,
+                                    nome_tabela, descricao_tabela, contagem)
+        if incluir_dados:
+            linhas = list(linhas)
         
         # Gerar CSV
-        gerar_csv_comparado(dados_csv, caminho_csv_saida)
+        gerar_csv_comparado(linhas, caminho_csv_saida)
         
-        return {
-            'sucesso': True,
-            'nome_tabela': nome_tabela,
-            'caminho_csv': caminho_csv_saida,
-            'num_colunas': len(colunas_ddl),
-            'num_colunas_novas': sum(1 for d in dados_csv if not d['rename_to']),
-            'num_colunas_existentes': sum(1 for d in dados_csv if d['rename_to']),
-            'dados_csv': dados_csv,
-            'erro': None
-        }
-        
-    except Exception as e:
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # Falhas esperadas: arquivo ausente/ilegível, JSON inválido ou CSV vazio e
+        # info_tabela incompleta; qualquer outra exceção é bug e sobe para o chamador
         return {
             'sucesso': False,
             'nome_tabela': None,
@@ -248,3 +433,15 @@ def processar_comparacao(caminho_ddl: str,
             'dados_csv': [],
             'erro': str(e)
         }
+    
+    return {
+        'sucesso': True,
+        'nome_tabela': nome_tabela,
+        'caminho_csv': caminho_csv_saida,
+        'num_colunas': len(colunas_ddl),
+        'num_colunas_novas': contagem['novas'],
+        'num_colunas_existentes': contagem['existentes'],
+        # A interface edita as linhas por nome de campo: dicionários só na resposta
+        'dados_csv': [dict(zip(CAMPOS_CSV, linha)) for linha in linhas] if incluir_dados else None,
+        'erro': None
+    }
@@ -22,10 +22,74 @@ Autor: Felipe Machado
 
 import json
 import csv
+import functools
+import hashlib
+import io
+import itertools
+import logging
 import re
 import os
+import pickle
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Any, Mapping, Match, Optional, Pattern, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # Opcional: sem orjson o JSON é gravado com o json da stdlib
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Padrões fixos, compilados uma única vez na importação do módulo
+_RE_CREATE_TABLE = re.compile(r"CREATE\s+TABLE\s+(?P<schema>\w+)\.(?P<nome_tabela>\w+)")
+# Os padrões de coluna e de descrição varrem o bloco inteiro em modo MULTILINE:
+# [^\S\n] é espaço sem quebra de linha, para que um match nunca atravesse linhas,
+# e o prefixo preguiçoso [^\n]*? reproduz a busca pelo primeiro match de cada linha
+_RE_COLUNA = re.compile(
+    r"^[^\S\n]*[^\n]*?(\d{6})?[^\S\n]*(?P<nome>\w+)[^\S\n]+(?P<tipo_dado>(?P<tipo_base>\w+)(\((?P<tipo_params>.*)\))?)[^\S\n]*"
+    r"(?P<nullable>(NOT)?[^\S\n]+NULL)?"
+    r"(?P<default>[^\S\n]+WITH[^\S\n]+DEFAULT([^\S\n]+(?P<valor_default>(\d+)|(\'.*\')))?)?",
+    re.IGNORECASE | re.MULTILINE
+)
+_RE_TIPO_DADO = re.compile(r"(?P<tipo>\w+)(\((?P<parametros>.+)\))?")
+_RE_DESCRICAO = re.compile(r"""
+    ^[^\S\n]*                     # Espaços iniciais
+    (?:\d+[^\S\n]+)?               # Número opcional no início
+    "?(?P<nome>[\w_]+)"?[^\S\n]+    # Nome da coluna (com aspas opcionais)
+    IS[^\S\n]+                      # Palavra-chave IS
+    '(?P<descricao>[^'\n]*)'        # Descrição entre aspas simples
+    [^\S\n]*(?:,|$)                 # Vírgula ou fim de linha
+""", re.VERBOSE | re.IGNORECASE | re.MULTILINE)
+_RE_FIM_LABELS = re.compile(r"\)\s*;")
+# Início de qualquer comando relevante do DDL, usado na varredura única do conteúdo.
+# A primeira letra fica fora do trecho sem diferenciação de maiúsculas: com uma
+# classe de caracteres no início o SRE pula direto para os candidatos (C/L)
+_RE_INICIO_COMANDO = re.compile(r"[CcLl](?:(?i:REATE\s+(?:UNIQUE\s+INDEX|TABLE))|(?i:ABEL\s+ON))")
+# Comandos de uma tabela: o schema/tabela são capturados e comparados depois,
+# então os padrões servem para qualquer tabela e são compilados uma única vez.
+# Nenhum deles usa repetição preguiçosa sobre texto arbitrário: o corpo do
+# CREATE TABLE é delimitado por uma busca separada do seu fechamento
+_RE_CREATE_TABLE_INICIO = re.compile(r"CREATE\s+TABLE\s+(?P<schema>\w+)\.(?P<tabela>\w+)\s*\(")
+_RE_CREATE_TABLE_FIM = re.compile(r"\)\s+IN\s+(?P<database>\w+)\.(?P<tablespace>\w+)")
+_RE_LABEL_TABELA = re.compile(
+    r"LABEL\s+ON\s+TABLE\s+(?P<schema>\w+)\.(?P<tabela>\w+)\s+"
+    r"IS\s+'(?P<descricao>.*)'",
+    re.IGNORECASE
+)
+_RE_LABEL_COLUNAS = re.compile(r"LABEL\s+ON\s+(?P<schema>\w+)\.(?P<tabela>\w+)\s*\(", re.IGNORECASE)
+_RE_CREATE_INDEX = re.compile(
+    r"CREATE\s+UNIQUE\s+INDEX\s+"
+    r"(?P<schema_indice>\w+)\.(?P<nome_indice>\w+)\s+"
+    r"ON\s+(?P<schema>\w+)\.(?P<tabela>\w+)\s*"
+    r"\((?P<colunas>[\w\W][^)]*)\)"
+)
+# Único grupo de captura (o nome): findall devolve direto a lista de nomes
+_RE_INDICE_COL = re.compile(r"(\w+)(?:\s+(?:ASC|DESC))?,?")
 
 
 def ler_arquivo_ddl(caminho_arquivo: str) -> str:
@@ -48,12 +112,14 @@ def ler_arquivo_ddl(caminho_arquivo: str) -> str:
         raise FileNotFoundError(f"Arquivo DDL não encontrado: {caminho_arquivo}")
 
 
-def extrair_nome_tabela(conteudo_ddl: str) -> str:
+def extrair_nome_tabela(conteudo_ddl: str,
+                        comandos: Optional[Mapping[str, Sequence[int]]] = None) -> str:
     """
     Extrai o nome da tabela do DDL.
     
     Args:
         conteudo_ddl: Conteúdo do arquivo DDL
+        comandos: Posições dos comandos já separadas por separar_comandos (opcional)
         
     Returns:
         Nome da tabela
@@ -61,60 +127,137 @@ def extrair_nome_tabela(conteudo_ddl: str) -> str:
     Raises:
         ValueError: Se não encontrar CREATE TABLE
     """
-    padrao = r"CREATE\s+TABLE\s+(?P<schema>\w+)\.(?P<nome_tabela>\w+)"
-    match = re.search(padrao, conteudo_ddl)
+    # Testa apenas as posições da varredura única, que o chamador pode
+    # repassar em seguida a extrair_informacoes_tabela
+    if comandos is None:
+        comandos = separar_comandos(conteudo_ddl)
+    for posicao in comandos['CREATE TABLE']:
+        match = _RE_CREATE_TABLE.match(conteudo_ddl, posicao)
+        if match:
+            return match.group('nome_tabela')
     
-    if not match:
-        raise ValueError("Não foi possível encontrar CREATE TABLE no DDL")
+    raise ValueError("Não foi possível encontrar CREATE TABLE no DDL")
+
+
+def separar_comandos(conteudo_ddl: str) -> Mapping[str, Tuple[int, ...]]:
+    """
+    Varre o DDL uma única vez e agrupa as posições de início de cada comando.
+    Sem cache global (prenderia DDLs grandes na memória): quem extrai mais de uma
+    informação do mesmo DDL calcula uma vez e repassa o resultado.
+    
+    Args:
+        conteudo_ddl: Conteúdo do arquivo DDL
+        
+    Returns:
+        Mapeamento somente leitura com as chaves 'CREATE TABLE', 'CREATE UNIQUE INDEX'
+        e 'LABEL ON', cada uma com a tupla (em ordem) das posições onde o comando começa
+    """
+    comandos = {'CREATE TABLE': [], 'CREATE UNIQUE INDEX': [], 'LABEL ON': []}
+    for match in _RE_INICIO_COMANDO.finditer(conteudo_ddl):
+        comandos[' '.join(match.group().upper().split())].append(match.start())
+    return MappingProxyType({comando: tuple(posicoes) for comando, posicoes in comandos.items()})
+
+
+def _mesma_tabela(match: Match, schema: str, nome_tabela: str) -> bool:
+    """Confere se o comando capturado é da tabela informada."""
+    if match.re.flags & re.IGNORECASE:
+        return match['tabela'].lower() == nome_tabela.lower() and match['schema'].lower() == schema.lower()
+    return match['tabela'] == nome_tabela and match['schema'] == schema
+
+
+def _primeiro_match(padrao: Pattern, conteudo_ddl: str, posicoes: Sequence[int],
+                    schema: str, nome_tabela: str) -> Optional[Match]:
+    """Aplica o padrão apenas nas posições de início de comando e devolve o primeiro match da tabela."""
+    for posicao in posicoes:
+        match = padrao.match(conteudo_ddl, posicao)
+        if match and _mesma_tabela(match, schema, nome_tabela):
+            return match
+    return None
+
+
+def _localizar_create_table(conteudo_ddl: str, posicoes: Sequence[int], nome_tabela: str) -> Optional[Dict[str, str]]:
+    """
+    Localiza o primeiro CREATE TABLE da tabela e separa o corpo com as colunas.
     
-    return match.group('nome_tabela')
+    Args:
+        conteudo_ddl: Conteúdo do arquivo DDL
+        posicoes: Posições dos comandos CREATE TABLE (ver separar_comandos)
+        nome_tabela: Nome da tabela
+        
+    Returns:
+        Dicionário com schema, colunas, database e tablespace, ou None se não encontrar
+    """
+    for posicao in posicoes:
+        inicio = _RE_CREATE_TABLE_INICIO.match(conteudo_ddl, posicao)
+        if not inicio or inicio['tabela'] != nome_tabela:
+            continue
+        
+        # O corpo tem ao menos um caractere e termina no primeiro ") IN db.ts",
+        # sem os espaços que antecedem o ')'
+        corpo = inicio.end()
+        fim = _RE_CREATE_TABLE_FIM.search(conteudo_ddl, corpo + 1)
+        if not fim:
+            continue
+        fim_corpo = fim.start()
+        while fim_corpo > corpo + 1 and conteudo_ddl[fim_corpo - 1].isspace():
+            fim_corpo -= 1
+        
+        return {
+            'schema': inicio['schema'],
+            'colunas': conteudo_ddl[corpo:fim_corpo],
+            'database': fim['database'],
+            'tablespace': fim['tablespace']
+        }
+    return None
 
 
-def extrair_informacoes_tabela(conteudo_ddl: str, nome_tabela: str) -> Dict[str, Any]:
+def extrair_informacoes_tabela(conteudo_ddl: str, nome_tabela: str,
+                               comandos: Optional[Mapping[str, Sequence[int]]] = None) -> Dict[str, Any]:
     """
     Extrai todas as informações da tabela do DDL.
     
     Args:
         conteudo_ddl: Conteúdo do arquivo DDL
         nome_tabela: Nome da tabela a ser processada
+        comandos: Posições dos comandos já separadas por separar_comandos (opcional)
         
     Returns:
         Dicionário com informações da tabela
     """
-    # Extrair informações básicas da tabela
-    padrao_create = (
-        r"CREATE\s+TABLE\s+(?P<schema>\w+)\." + nome_tabela + r"\s*"
-        r"\s*\((?P<colunas>[\W\w]+?)\s*\)\s+"
-        r"IN\s+(?P<database>\w+)\.(?P<tablespace>\w+)"
-    )
+    # Uma única varredura localiza todos os comandos; os padrões abaixo só são
+    # testados nessas posições, sem percorrer o DDL inteiro de novo
+    if comandos is None:
+        comandos = separar_comandos(conteudo_ddl)
     
-    match_create = re.search(padrao_create, conteudo_ddl)
+    # Extrair informações básicas da tabela
+    match_create = _localizar_create_table(conteudo_ddl, comandos['CREATE TABLE'], nome_tabela)
     if not match_create:
         raise ValueError(f"Não foi possível encontrar definição da tabela {nome_tabela}")
     
     # Extrair descrição da tabela
-    padrao_label_tabela = (
-        rf"LABEL\s+ON\s+TABLE\s+{match_create['schema']}\.{nome_tabela}\s+"
-        r"IS\s+'(?P<descricao>.*)'"
-    )
-    match_label = re.search(padrao_label_tabela, conteudo_ddl, re.IGNORECASE)
+    match_label = _primeiro_match(_RE_LABEL_TABELA, conteudo_ddl, comandos['LABEL ON'],
+                                  match_create['schema'], nome_tabela)
     
     # Log para depuração
-    print(f"[DEBUG] Padrão de busca da descrição: {padrao_label_tabela}")
-    print(f"[DEBUG] Match encontrado: {match_label is not None}")
+    logger.debug("Busca da descrição: LABEL ON TABLE %s.%s", match_create['schema'], nome_tabela)
+    logger.debug("Match encontrado: %s", match_label is not None)
     
     if match_label:
         descricao_tabela = match_label.group('descricao')
-        print(f"[DEBUG] Descrição da tabela encontrada: {descricao_tabela}")
+        logger.debug("Descrição da tabela encontrada: %s", descricao_tabela)
     else:
         descricao_tabela = ""
-        print("[DEBUG] Nenhuma descrição encontrada para a tabela")
+        logger.debug("Nenhuma descrição encontrada para a tabela")
+    
+    # Extrair descrições das colunas uma única vez e repassá-las ao laço das colunas
+    descricoes_colunas = extrair_descricoes_colunas(conteudo_ddl, match_create['schema'], nome_tabela, comandos)
     
     # Extrair colunas
-    colunas = extrair_colunas(match_create['colunas'], conteudo_ddl, match_create['schema'], nome_tabela)
+    colunas = extrair_colunas(match_create['colunas'], conteudo_ddl, match_create['schema'], nome_tabela,
+                              comandos, descricoes_colunas)
     
     # Extrair índices únicos
-    indices_unicos = extrair_indices_unicos(conteudo_ddl, match_create['schema'], nome_tabela)
+    indices_unicos = extrair_indices_unicos(conteudo_ddl, match_create['schema'], nome_tabela, comandos)
     
     return {
         'nome': nome_tabela,
@@ -127,7 +270,9 @@ def extrair_informacoes_tabela(conteudo_ddl: str, nome_tabela: str) -> Dict[str,
     }
 
 
-def extrair_colunas(texto_colunas: str, conteudo_ddl: str, schema: str, nome_tabela: str) -> List[Dict[str, Any]]:
+def extrair_colunas(texto_colunas: str, conteudo_ddl: str, schema: str, nome_tabela: str,
+                    comandos: Optional[Mapping[str, Sequence[int]]] = None,
+                    descricoes_colunas: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
     """
     Extrai informações das colunas da tabela.
     
@@ -136,55 +281,90 @@ def extrair_colunas(texto_colunas: str, conteudo_ddl: str, schema: str, nome_tab
         conteudo_ddl: Conteúdo completo do DDL (para buscar descrições)
         schema: Schema da tabela
         nome_tabela: Nome da tabela
+        comandos: Posições dos comandos já separadas por separar_comandos (opcional)
+        descricoes_colunas: Descrições já extraídas por extrair_descricoes_colunas (opcional)
         
     Returns:
         Lista de dicionários com informações das colunas
     """
     colunas = []
     
-    # Extrair descrições das colunas
-    print("[DEBUG] Extraindo descrições das colunas...")
-    descricoes_colunas = extrair_descricoes_colunas(conteudo_ddl, schema, nome_tabela)
-    print(f"[DEBUG] Descrições encontradas: {descricoes_colunas}")
-    
-    # Processar cada linha de definição de coluna
-    print("[DEBUG] Processando definições de colunas...")
-    for linha in texto_colunas.split('\n'):
-        linha = linha.strip()
-        if not linha:
-            continue
-            
-        padrao_coluna = (
-            r"(\d{6})?\s*(?P<nome>\w+)\s+(?P<tipo_dado>\w+(\(.*\))?)\s*"
-            r"(?P<nullable>(NOT)?\s+NULL)?"
-            r"(?P<default>\s+WITH\s+DEFAULT(\s+(?P<valor_default>(\d+)|(\'.*\')))?)?"
+    # Extrair descrições das colunas, se não vierem prontas
+    if descricoes_colunas is None:
+        logger.debug("Extraindo descrições das colunas...")
+        descricoes_colunas = extrair_descricoes_colunas(conteudo_ddl, schema, nome_tabela, comandos)
+    logger.debug("Descrições encontradas: %s", descricoes_colunas)
+    
+    # Processar as definições de coluna numa única varredura do bloco
+    # (o nível de log é consultado uma vez, fora do laço por coluna)
+    depurar = logger.isEnabledFor(logging.DEBUG)
+    logger.debug("Processando definições de colunas...")
+    for match in _RE_COLUNA.finditer(texto_colunas):
+        # Todos os grupos numa única chamada, em vez de um match.group por campo
+        nome_coluna, tipo_base, tipo_params, texto_nullable, texto_default = match.group(
+            'nome', 'tipo_base', 'tipo_params', 'nullable', 'valor_default'
         )
+        # Nome internado: o mesmo objeto serve ao dicionário, ao CSV e às buscas por coluna
+        nome_coluna = sys.intern(nome_coluna)
+        if depurar:
+            logger.debug("Processando coluna: %s", nome_coluna)
         
-        match = re.search(padrao_coluna, linha, re.IGNORECASE)
-        if match:
-            nome_coluna = match.group('nome')
-            print(f"[DEBUG] Processando coluna: {nome_coluna}")
-            
-            tipo_dado = processar_tipo_dado(match.group('tipo_dado'))
-            nullable = not bool(match.group('nullable') and 'NOT' in match.group('nullable').upper())
-            valor_default = processar_valor_default(match.group('valor_default'), tipo_dado['tipo'])
-            
-            # Obter descrição ou usar vazio se não existir
-            descricao = descricoes_colunas.get(nome_coluna, "")
-            print(f"[DEBUG] Descrição para {nome_coluna}: {descricao}")
-            
-            coluna = {
-                'nome': nome_coluna,
-                'tipo_dado': tipo_dado,
-                'nullable': nullable,
-                'valor_default': valor_default,
-                'descricao': descricao
-            }
-            colunas.append(coluna)
+        tipo_dado = montar_tipo_dado(tipo_base, tipo_params)
+        nullable = not bool(texto_nullable and 'NOT' in texto_nullable.upper())
+        valor_default = processar_valor_default(texto_default, tipo_base)
+        
+        # Obter descrição ou usar vazio se não existir
+        descricao = descricoes_colunas.get(nome_coluna, "")
+        if depurar:
+            logger.debug("Descrição para %s: %s", nome_coluna, descricao)
+        
+        coluna = {
+            'nome': nome_coluna,
+            'tipo_dado': tipo_dado,
+            'nullable': nullable,
+            'valor_default': valor_default,
+            'descricao': descricao
+        }
+        colunas.append(coluna)
     
     return colunas
 
 
+# Tabelas de conversão de tipos, montadas uma única vez na importação
+TIPOS_TEXTO = frozenset({'VARCHAR', 'CHAR'})
+TIPOS_DECIMAIS = frozenset({'DEC', 'DECIMAL', 'NUMERIC'})
+TIPOS_INTEIROS = frozenset({'INTEGER', 'INT', 'SMALLINT'})
+MAPEAMENTO_TIPOS_MLOPS = {
+    'DATE': 'date',
+    'CHAR': 'string',
+    'VARCHAR': 'string',
+    'TIMESTAMP': 'timestamp',
+    'TIME': 'string',
+    'INTEGER': 'integer',
+    'INT': 'integer',
+    'SMALLINT': 'integer',
+}
+CONVERSOES_DEFAULT = {
+    'VARCHAR': '',
+    'CHAR': '',
+    'INT': 0,
+    'INTEGER': 0,
+    'SMALLINT': 0,
+    'DEC': 0,
+    'DECIMAL': 0,
+    'NUMERIC': 0,
+    'DATE': 'CURRENT_DATE',
+    'TIME': 'CURRENT_TIME',
+    'TIMESTAMP': 'CURRENT_TIMESTAMP'
+}
+# (name, input, runOn) da curação aplicada a cada tipo
+CURACOES_POR_TIPO = {
+    'INTEGER': ('StringToType', 'integer', ('kafka', 'unload')),
+    'SMALLINT': ('StringToType', 'integer', ('kafka', 'unload')),
+    'DATE': ('StringToDate', 'dd.MM.yyyy', ('unload',)),
+}
+
+
 def processar_tipo_dado(tipo_string: str) -> Dict[str, Any]:
     """
     Processa string de tipo de dado e extrai informações.
@@ -195,29 +375,60 @@ def processar_tipo_dado(tipo_string: str) -> Dict[str, Any]:
     Returns:
         Dicionário com tipo, tamanho, precisão e escala
     """
-    padrao = r"(?P<tipo>\w+)(\((?P<parametros>.+)\))?"
-    match = re.match(padrao, tipo_string)
+    match = _RE_TIPO_DADO.match(tipo_string)
     
     if not match:
         return {'tipo': tipo_string, 'tamanho': None, 'precisao': None, 'escala': None}
     
-    tipo = match.group('tipo')
-    parametros = match.group('parametros')
+    return montar_tipo_dado(match.group('tipo'), match.group('parametros'))
+
+
+@functools.lru_cache(maxsize=256)
+def _converter_parametros_tipo(tipo: str, parametros: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """
+    Converte os parâmetros de um tipo em (tamanho, precisão, escala).
+    Os DDLs repetem poucos tipos (VARCHAR(50), CHAR(1), DEC(15,2)...), por isso o cache.
     
+    Args:
+        tipo: Tipo base (ex: VARCHAR, DEC)
+        parametros: Texto entre parênteses (ex: '50', '10,2') ou None
+        
+    Returns:
+        Tupla (tamanho, precisao, escala), com None onde não se aplica
+    """
     tamanho = None
     precisao = None
     escala = None
     
     if parametros:
-        if tipo in ['VARCHAR', 'CHAR']:
+        if tipo in TIPOS_TEXTO:
             tamanho = int(parametros)
-        elif tipo in ['DEC', 'DECIMAL', 'NUMERIC']:
+        elif tipo in TIPOS_DECIMAIS:
             if ',' in parametros:
                 precisao, escala = map(int, parametros.split(','))
             else:
                 precisao = int(parametros)
                 escala = 0
     
+    return tamanho, precisao, escala
+
+
+def montar_tipo_dado(tipo: str, parametros: Optional[str]) -> Dict[str, Any]:
+    """
+    Monta as informações do tipo de dado a partir do tipo e dos parâmetros já separados
+    (o padrão de coluna captura os dois, sem um segundo regex por coluna).
+    
+    Args:
+        tipo: Tipo base (ex: VARCHAR, DEC)
+        parametros: Texto entre parênteses (ex: '50', '10,2') ou None
+        
+    Returns:
+        Dicionário com tipo, tamanho, precisão e escala
+    """
+    # A conversão dos parâmetros fica em cache; o dicionário é sempre novo,
+    # então quem recebe pode alterá-lo sem afetar as outras colunas
+    tamanho, precisao, escala = _converter_parametros_tipo(tipo, parametros)
+    
     return {
         'tipo': tipo,
         'tamanho': tamanho,
@@ -240,27 +451,45 @@ def processar_valor_default(valor_default: Optional[str], tipo: str) -> Any:
     if not valor_default:
         return None
     
-    valor_limpo = valor_default.strip().replace("'", "")
-    
-    # Conversões por tipo
-    conversoes_default = {
-        'VARCHAR': '',
-        'CHAR': '',
-        'INT': 0,
-        'INTEGER': 0,
-        'SMALLINT': 0,
-        'DEC': 0,
-        'DECIMAL': 0,
-        'NUMERIC': 0,
-        'DATE': 'CURRENT_DATE',
-        'TIME': 'CURRENT_TIME',
-        'TIMESTAMP': 'CURRENT_TIMESTAMP'
-    }
+    # Conversões por tipo; o valor literal só é limpo para tipos sem conversão
+    if tipo in CONVERSOES_DEFAULT:
+        return CONVERSOES_DEFAULT[tipo]
     
-    return conversoes_default.get(tipo, valor_limpo)
+    return valor_default.strip().replace("'", "")
 
 
-def extrair_descricoes_colunas(conteudo_ddl: str, schema: str, nome_tabela: str) -> Dict[str, str]:
+def _descricoes_por_linha(texto_colunas: str) -> Iterator[Tuple[str, str]]:
+    """
+    Percorre o bloco LABEL ON linha a linha gerando os pares (nome, descrição).
+    
+    O formato usual (``NOME IS 'descrição',``) é reconhecido com operações de
+    string; qualquer outra linha é entregue a _RE_DESCRICAO, de modo que o
+    resultado é sempre o mesmo da varredura com a expressão regular.
+    
+    Args:
+        texto_colunas: Trecho entre o '(' do LABEL ON e o ');' final
+        
+    Yields:
+        Tuplas (nome da coluna, descrição sem tratamento)
+    """
+    for linha in texto_colunas.split('\n'):
+        if "'" not in linha:
+            continue
+        nome, separador, resto = linha.lstrip().partition(" IS '")
+        if separador and nome and nome.replace('_', 'a').isalnum():
+            descricao, aspa, final = resto.partition("'")
+            if aspa:
+                final = final.lstrip()
+                if not final or final[0] == ',':
+                    yield nome, descricao
+                    continue
+        match_desc = _RE_DESCRICAO.match(linha)
+        if match_desc:
+            yield match_desc.group('nome', 'descricao')
+
+
+def extrair_descricoes_colunas(conteudo_ddl: str, schema: str, nome_tabela: str,
+                               comandos: Optional[Mapping[str, Sequence[int]]] = None) -> Dict[str, str]:
     """
     Extrai descrições das colunas do DDL.
     
@@ -268,57 +497,42 @@ def extrair_descricoes_colunas(conteudo_ddl: str, schema: str, nome_tabela: str)
         conteudo_ddl: Conteúdo do DDL
         schema: Schema da tabela
         nome_tabela: Nome da tabela
+        comandos: Posições dos comandos já separadas por separar_comandos (opcional)
         
     Returns:
         Dicionário mapeando nome da coluna para sua descrição
     """
-    # Padrão para encontrar o bloco de LABEL ON TABLE
-    padrao_labels = (
-        rf"LABEL\s+ON\s+{re.escape(schema)}\.{re.escape(nome_tabela)}\s*"
-        r"\((?P<colunas>[\s\S]*?)\)\s*;"
-    )
-    
-    print(f"[DEBUG] Buscando descrições para {schema}.{nome_tabela}")
-    
-    # Buscar o bloco de descrições
-    match = re.search(padrao_labels, conteudo_ddl, re.IGNORECASE)
-    if not match:
-        print(f"[DEBUG] Nenhum bloco LABEL encontrado para {schema}.{nome_tabela}")
+    logger.debug("Buscando descrições para %s.%s", schema, nome_tabela)
+    
+    # Localizar o cabeçalho e, a partir dele, o primeiro ')' seguido de ';'
+    if comandos is None:
+        comandos = separar_comandos(conteudo_ddl)
+    match = _primeiro_match(_RE_LABEL_COLUNAS, conteudo_ddl, comandos['LABEL ON'], schema, nome_tabela)
+    match_fim = match and _RE_FIM_LABELS.search(conteudo_ddl, match.end())
+    if not match_fim:
+        logger.debug("Nenhum bloco LABEL encontrado para %s.%s", schema, nome_tabela)
         return {}
     
-    texto_colunas = match.group('colunas')
-    print(f"[DEBUG] Texto das descrições encontrado: {texto_colunas[:100]}...")
-    
-    # Padrão para extrair cada descrição de coluna
-    padrao_descricao = r"""
-        ^\s*                         # Espaços iniciais
-        (?:\d+\s+)?                 # Número opcional no início
-        "?(?P<nome>[\w_]+)"?\s+    # Nome da coluna (com aspas opcionais)
-        IS\s+                        # Palavra-chave IS
-        '(?P<descricao>[^']*)'       # Descrição entre aspas simples
-        \s*(?:,|$)                   # Vírgula ou fim de linha
-    """
+    texto_colunas = conteudo_ddl[match.end():match_fim.start()]
+    depurar = logger.isEnabledFor(logging.DEBUG)
+    if depurar:
+        logger.debug("Texto das descrições encontrado: %s...", texto_colunas[:100])
     
     descricoes = {}
     
-    # Processar cada linha do bloco de descrições
-    for linha in texto_colunas.split('\n'):
-        linha = linha.strip()
-        if not linha or linha.isspace():
-            continue
-            
-        match_desc = re.search(padrao_descricao, linha, re.VERBOSE | re.IGNORECASE)
-        if match_desc:
-            nome = match_desc.group('nome')
-            descricao = match_desc.group('descricao').strip()
-            descricoes[nome] = descricao
-            print(f"[DEBUG] Descrição encontrada - Coluna: {nome}, Descrição: {descricao}")
+    # Processar o bloco de descrições linha a linha
+    for nome, descricao in _descricoes_por_linha(texto_colunas):
+        descricao = descricao.strip()
+        descricoes[nome] = descricao
+        if depurar:
+            logger.debug("Descrição encontrada - Coluna: %s, Descrição: %s", nome, descricao)
     
-    print(f"[DEBUG] Total de descrições encontradas: {len(descricoes)}")
+    logger.debug("Total de descrições encontradas: %s", len(descricoes))
     return descricoes
 
 
-def extrair_indices_unicos(conteudo_ddl: str, schema: str, nome_tabela: str) -> List[Dict[str, Any]]:
+def extrair_indices_unicos(conteudo_ddl: str, schema: str, nome_tabela: str,
+                           comandos: Optional[Mapping[str, Sequence[int]]] = None) -> List[Dict[str, Any]]:
     """
     Extrai informações dos índices únicos da tabela.
     
@@ -326,30 +540,31 @@ def extrair_indices_unicos(conteudo_ddl: str, schema: str, nome_tabela: str) ->
         conteudo_ddl: Conteúdo do DDL
         schema: Schema da tabela
         nome_tabela: Nome da tabela
+        comandos: Posições dos comandos já separadas por separar_comandos (opcional)
         
     Returns:
         Lista de dicionários com informações dos índices
     """
-    padrao_indice = (
-        r"CREATE\s+UNIQUE\s+INDEX\s+"
-        r"(?P<schema_indice>\w+)\.(?P<nome_indice>\w+)\s+"
-        rf"ON\s+{schema}\.{nome_tabela}\s*"
-        r"\((?P<colunas>[\w\W]+?)\)"
-    )
+    # O padrão do índice lê as colunas até o primeiro ')' com [^)]*, sem backtracking
+    if comandos is None:
+        comandos = separar_comandos(conteudo_ddl)
     
     indices = []
+    fim_anterior = 0
     
-    for match in re.finditer(padrao_indice, conteudo_ddl):
-        colunas_indice = []
-        texto_colunas = match.group('colunas')
-        
-        for col_match in re.finditer(r"(?P<nome>\w+)(\s+(?P<ordem>ASC|DESC))?,?", texto_colunas):
-            colunas_indice.append(col_match.group('nome'))
+    for posicao in comandos['CREATE UNIQUE INDEX']:
+        # Mesma semântica do finditer: matches não se sobrepõem
+        if posicao < fim_anterior:
+            continue
+        match = _RE_CREATE_INDEX.match(conteudo_ddl, posicao)
+        if not match or not _mesma_tabela(match, schema, nome_tabela):
+            continue
+        fim_anterior = match.end()
         
         indice = {
             'schema': match.group('schema_indice'),
             'nome': match.group('nome_indice'),
-            'colunas': colunas_indice
+            'colunas': _RE_INDICE_COL.findall(match.group('colunas'))
         }
         indices.append(indice)
     
@@ -367,24 +582,11 @@ def converter_tipo_para_mlops(tipo_dado: Dict[str, Any]) -> str:
         Tipo de dado no formato MLOps
     """
     tipo = tipo_dado['tipo']
-    precisao = tipo_dado['precisao']
-    escala = tipo_dado['escala']
-    
-    mapeamento_tipos = {
-        'DATE': 'date',
-        'CHAR': 'string',
-        'VARCHAR': 'string',
-        'TIMESTAMP': 'timestamp',
-        'TIME': 'string',
-        'INTEGER': 'integer',
-        'INT': 'integer',
-        'SMALLINT': 'integer',
-    }
     
-    if tipo in ['DEC', 'DECIMAL', 'NUMERIC']:
-        return f"decimal({precisao}, {escala})"
+    if tipo in TIPOS_DECIMAIS:
+        return f"decimal({tipo_dado['precisao']}, {tipo_dado['escala']})"
     
-    return mapeamento_tipos.get(tipo, 'string')
+    return MAPEAMENTO_TIPOS_MLOPS.get(tipo, 'string')
 
 
 def gerar_curacoes(tipo_original: str) -> List[Dict[str, Any]]:
@@ -397,28 +599,16 @@ def gerar_curacoes(tipo_original: str) -> List[Dict[str, Any]]:
     Returns:
         Lista de curações a serem aplicadas
     """
-    curacoes = []
-    
-    if tipo_original == "INTEGER":
-        curacoes.append({
-            "name": "StringToType",
-            "input": "integer",
-            "runOn": ["kafka", "unload"]
-        })
-    elif tipo_original == "SMALLINT":
-        curacoes.append({
-            "name": "StringToType",
-            "input": "integer",
-            "runOn": ["kafka", "unload"]
-        })
-    elif tipo_original == "DATE":
-        curacoes.append({
-            "name": "StringToDate",
-            "input": "dd.MM.yyyy",
-            "runOn": ["unload"]
-        })
+    curacao = CURACOES_POR_TIPO.get(tipo_original)
+    if curacao is None:
+        return []
     
-    return curacoes
+    nome, entrada, executar_em = curacao
+    return [{
+        "name": nome,
+        "input": entrada,
+        "runOn": list(executar_em)
+    }]
 
 
 def gerar_campos_auditoria() -> List[Dict[str, Any]]:
@@ -456,6 +646,31 @@ def gerar_campos_auditoria() -> List[Dict[str, Any]]:
     ]
 
 
+# Estado reaproveitado entre as gravações de CSV de um mesmo processo/thread
+CAMPOS_DICIONARIO_CSV = (
+    'tabela', 'descricao_mf', 'coluna_mf', 'rename_to',
+    'descricao_coluna_mf', 'descricao_oficial', 'tipo_original'
+)
+_PASTAS_CRIADAS = set()
+_csv_local = threading.local()
+
+
+def _buffer_csv() -> io.StringIO:
+    """
+    Retorna o buffer de texto da thread atual, vazio, para montar um CSV.
+    
+    Returns:
+        StringIO reaproveitado entre as chamadas
+    """
+    buffer = getattr(_csv_local, 'buffer', None)
+    if buffer is None:
+        buffer = _csv_local.buffer = io.StringIO(newline='')
+    else:
+        buffer.seek(0)
+        buffer.truncate()
+    return buffer
+
+
 def criar_dicionario_csv(info_tabela: Dict[str, Any], caminho_saida: str) -> None:
     """
     Cria arquivo CSV com dicionário da tabela para preenchimento manual.
@@ -465,32 +680,52 @@ def criar_dicionario_csv(info_tabela: Dict[str, Any], caminho_saida: str) -> Non
         info_tabela: Informações da tabela
         caminho_saida: Caminho onde salvar o arquivo CSV
     """
-    linhas = []
-    
-    for coluna in info_tabela['colunas']:
-        # Extrair tipo de dado da coluna
-        tipo_dado = coluna.get('tipo_dado', {})
-        tipo_original = tipo_dado.get('tipo', 'VARCHAR')
-        
-        linha = {
-            'tabela': info_tabela['nome'],
-            'descricao_mf': info_tabela.get('descricao', ''),
-            'coluna_mf': coluna['nome'],
-            'rename_to': coluna['nome'],  # Preenche com o nome da coluna por padrão
-            'descricao_coluna_mf': coluna.get('descricao', ''),
-            'descricao_oficial': '',  # Deixar vazio para preenchimento manual
-            'tipo_original': tipo_original  # Adiciona o tipo de dado original
-        }
-        linhas.append(linha)
-    
-    # Criar diretório se não existir
-    Path(caminho_saida).parent.mkdir(parents=True, exist_ok=True)
+    if not info_tabela['colunas']:
+        raise ValueError(f"Nenhuma coluna encontrada na tabela {info_tabela['nome']}")
+    
+    nome_tabela = info_tabela['nome']
+    descricao_tabela = info_tabela.get('descricao', '')
+    
+    # Linhas geradas sob demanda, na ordem de CAMPOS_DICIONARIO_CSV
+    linhas = (
+        (
+            nome_tabela,
+            descricao_tabela,
+            coluna['nome'],
+            coluna['nome'],  # rename_to: preenche com o nome da coluna por padrão
+            coluna.get('descricao', ''),
+            '',  # descricao_oficial: vazia para preenchimento manual
+            coluna.get('tipo_dado', {}).get('tipo', 'VARCHAR')  # tipo de dado original
+        )
+        for coluna in info_tabela['colunas']
+    )
     
-    with open(caminho_saida, 'w', newline='', encoding='utf-8') as arquivo:
-        campos = linhas[0].keys()
-        writer = csv.DictWriter(arquivo, fieldnames=campos, delimiter=';')
-        writer.writeheader()
-        writer.writerows(linhas)
+    # Criar diretório se não existir (uma vez por pasta em cada processo)
+    pasta = os.path.dirname(caminho_saida)
+    if pasta not in _PASTAS_CRIADAS:
+        Path(pasta or '.').mkdir(parents=True, exist_ok=True)
+        _PASTAS_CRIADAS.add(pasta)
+    
+    # Montar o CSV no buffer reaproveitado da thread e gravar numa única escrita
+    buffer = _buffer_csv()
+    writer = csv.writer(buffer, delimiter=';')
+    writer.writerow(CAMPOS_DICIONARIO_CSV)
+    writer.writerows(linhas)
+    dados = buffer.getvalue().encode('utf-8')
+    
+    # Gravar em arquivo temporário e publicar com os.replace: processos paralelos
+    # gerando a mesma tabela nunca intercalam bytes, e saídas reaproveitadas por
+    # hard link não são truncadas junto
+    caminho_temp = f"{caminho_saida}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        arquivo = open(caminho_temp, 'wb')
+    except FileNotFoundError:
+        # A pasta foi removida depois de registrada em _PASTAS_CRIADAS
+        Path(pasta or '.').mkdir(parents=True, exist_ok=True)
+        arquivo = open(caminho_temp, 'wb')
+    with arquivo:
+        arquivo.write(dados)
+    os.replace(caminho_temp, caminho_saida)
 
 
 def ler_dicionario_csv(caminho_arquivo: str) -> List[Dict[str, str]]:
@@ -504,20 +739,46 @@ def ler_dicionario_csv(caminho_arquivo: str) -> List[Dict[str, str]]:
         Lista de dicionários com dados do CSV
         
     Raises:
-        ValueError: Se algum campo obrigatório estiver vazio
+        ValueError: Se algum campo obrigatório estiver vazio ou a linha tiver
+            mais campos que o cabeçalho
     """
-    with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
-        reader = csv.DictReader(arquivo, delimiter=';')
-        dados = list(reader)
+    dados = []
     
-    # Validar preenchimento
-    for linha in dados:
-        for campo, valor in linha.items():
-            if not valor or valor.strip() == '':
+    # Validar o preenchimento linha a linha, durante a leitura: um CSV incompleto
+    # falha na primeira linha vazia sem carregar o restante do arquivo.
+    # As linhas chegam como listas (csv.reader); o dicionário só é montado
+    # para as linhas já conferidas
+    with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
+        leitor = csv.reader(arquivo, delimiter=';')
+        cabecalho = next(leitor, None)
+        if cabecalho is None:
+            return dados
+        num_campos = len(cabecalho)
+        
+        for valores in leitor:
+            if not valores:  # Linhas em branco são ignoradas, como no DictReader
+                continue
+            if len(valores) == num_campos and all(valor and not valor.isspace() for valor in valores):
+                dados.append(dict(zip(cabecalho, valores)))
+                continue
+            
+            # Linha incompleta ou com campo vazio: montar como o DictReader (campos
+            # ausentes ficam None) para apontar o primeiro campo vazio
+            linha = dict(itertools.zip_longest(cabecalho, valores[:num_campos]))
+            campo_vazio = next((campo for campo, valor in linha.items() if not valor or valor.isspace()), None)
+            if campo_vazio is None and len(valores) <= num_campos:
+                # Cabeçalho com nomes repetidos: vale o último valor de cada nome
+                dados.append(linha)
+                continue
+            if campo_vazio is None:
                 raise ValueError(
-                    f"Campo '{campo}' da coluna '{linha.get('coluna_mf', 'N/A')}' está vazio. "
-                    f"Preencha o dicionário antes de continuar."
+                    f"A linha da coluna '{linha.get('coluna_mf', 'N/A')}' tem {len(valores)} campos, "
+                    f"mas o cabeçalho tem {num_campos}. Corrija o dicionário antes de continuar."
                 )
+            raise ValueError(
+                f"Campo '{campo_vazio}' da coluna '{linha.get('coluna_mf', 'N/A')}' está vazio. "
+                f"Preencha o dicionário antes de continuar."
+            )
     
     return dados
 
@@ -540,40 +801,55 @@ def criar_configuracao_mlops(info_tabela: Dict[str, Any], dicionario: List[Dict[
     
     campos = []
     
-    # Criar mapeamento do dicionário para busca rápida
-    dict_map = {item['coluna_mf']: item for item in dicionario}
+    colunas = info_tabela['colunas']
+    
+    # O dicionário gerado a partir do DDL segue a ordem de info_tabela['colunas']:
+    # nesse caso as linhas são pareadas direto; senão (CSV editado pelo usuário)
+    # a busca é feita por um mapeamento coluna -> linha
+    alinhado = len(dicionario) == len(colunas) and all(
+        item['coluna_mf'] == coluna['nome'] for coluna, item in zip(colunas, dicionario)
+    )
+    if alinhado:
+        pares = zip(colunas, dicionario)
+    else:
+        # Chaves internadas, como os nomes vindos do DDL: a busca compara por identidade
+        dict_map = {sys.intern(item['coluna_mf']): item for item in dicionario}
+        pares = ((coluna, dict_map.get(coluna['nome'])) for coluna in colunas)
+    
+    # Curações montadas uma vez por tipo e compartilhadas pelos campos do mesmo tipo
+    curacoes_por_tipo = {}
     
     # Processar apenas as colunas que existem no dicionário
-    for coluna in info_tabela['colunas']:
-        if coluna['nome'] not in dict_map:
-            print(f"[AVISO] Coluna '{coluna['nome']}' não encontrada no dicionário - pulando...")
+    for coluna, dados_dict in pares:
+        if dados_dict is None:
+            logger.warning("Coluna '%s' não encontrada no dicionário - pulando...", coluna['nome'])
             continue
-            
-        dados_dict = dict_map[coluna['nome']]
+        
+        tipo = coluna['tipo_dado']['tipo']
         
         # Converter tipo para MLOps
         tipo_mlops = converter_tipo_para_mlops(coluna['tipo_dado'])
         
-        # Criar campo
-        campo = {
-            "name": coluna['nome'],
-            "type": tipo_mlops,
-            "nullable": coluna['nullable'],
-            "metadata": {
-                "description": dados_dict['descricao_coluna'],
-                "inputType": coluna['tipo_dado']['tipo'],
-                "outputType": tipo_mlops,
-                "renameTo": dados_dict['coluna'],
-                "jsonParameterName": "int" if coluna['tipo_dado']['tipo'] in ['INTEGER', 'INT', 'SMALLINT'] else "string"
-            }
+        # Metadados completos (com as curações, se houver) antes de montar o campo
+        metadata = {
+            "description": dados_dict['descricao_coluna'],
+            "inputType": tipo,
+            "outputType": tipo_mlops,
+            "renameTo": dados_dict['coluna'],
+            "jsonParameterName": "int" if tipo in TIPOS_INTEIROS else "string"
         }
-        
-        # Adicionar curações se necessário
-        curacoes = gerar_curacoes(coluna['tipo_dado']['tipo'])
+        curacoes = curacoes_por_tipo.get(tipo)
+        if curacoes is None:
+            curacoes = curacoes_por_tipo[tipo] = gerar_curacoes(tipo)
         if curacoes:
-            campo["metadata"]["curations"] = curacoes
+            metadata["curations"] = curacoes
         
-        campos.append(campo)
+        campos.append({
+            "name": coluna['nome'],
+            "type": tipo_mlops,
+            "nullable": coluna['nullable'],
+            "metadata": metadata
+        })
     
     # Adicionar campos de auditoria
     campos.extend(gerar_campos_auditoria())
@@ -594,18 +870,26 @@ def criar_configuracao_mlops(info_tabela: Dict[str, Any], dicionario: List[Dict[
     return configuracao
 
 
-def salvar_configuracao_json(configuracao: Dict[str, Any], caminho_saida: str) -> None:
+def salvar_configuracao_json(configuracao: Dict[str, Any], caminho_saida: str, indentado: bool = True) -> None:
     """
     Salva configuração MLOps em arquivo JSON.
     
     Args:
         configuracao: Configuração MLOps
         caminho_saida: Caminho onde salvar o arquivo
+        indentado: Se True (padrão), grava indentado para leitura humana; se False,
+            grava compacto (menor e mais rápido, para consumo só por máquinas)
     """
     Path(caminho_saida).parent.mkdir(parents=True, exist_ok=True)
     
-    with open(caminho_saida, 'w', encoding='utf-8') as arquivo:
-        json.dump(configuracao, arquivo, indent=4, ensure_ascii=False)
+    # orjson serializa direto para bytes UTF-8; a stdlib gera o mesmo layout
+    if orjson is not None:
+        conteudo = orjson.dumps(configuracao, option=orjson.OPT_INDENT_2) if indentado else orjson.dumps(configuracao)
+    elif indentado:
+        conteudo = json.dumps(configuracao, indent=2, ensure_ascii=False).encode('utf-8')
+    else:
+        conteudo = json.dumps(configuracao, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    Path(caminho_saida).write_bytes(conteudo)
 
 
 def buscar_arquivos_ddl(pasta_ddls: str = "ddls") -> List[str]:
@@ -618,15 +902,14 @@ def buscar_arquivos_ddl(pasta_ddls: str = "ddls") -> List[str]:
     Returns:
         Lista de caminhos para arquivos DDL encontrados
     """
-    pasta_ddls = Path(pasta_ddls)
-    if not pasta_ddls.exists():
+    # os.scandir reaproveita o tipo de cada entrada já lido do diretório,
+    # sem criar um Path nem repetir o stat por arquivo
+    try:
+        with os.scandir(pasta_ddls) as entradas:
+            return [entrada.path for entrada in entradas
+                    if entrada.name.endswith('.txt') and entrada.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
         return []
-    
-    arquivos_ddl = []
-    for arquivo in pasta_ddls.glob("*.txt"):
-        arquivos_ddl.append(str(arquivo))
-    
-    return arquivos_ddl
 
 
 def gerar_dicionario_automatico(info_tabela: Dict[str, Any]) -> List[Dict[str, str]]:
@@ -662,7 +945,115 @@ def gerar_dicionario_automatico(info_tabela: Dict[str, Any]) -> List[Dict[str, s
     return dicionario
 
 
-def processar_arquivo_ddl(caminho_ddl: str, pasta_saida: str = "output") -> Dict[str, Any]:
+def assinatura_tabela(info_tabela: Dict[str, Any]) -> str:
+    """
+    Calcula a assinatura do conteúdo que vai para o dicionário CSV.
+    
+    Args:
+        info_tabela: Informações da tabela
+        
+    Returns:
+        Hash hexadecimal de (nome, descrição, colunas) da tabela
+    """
+    colunas = [
+        (coluna['nome'], coluna.get('descricao', ''), coluna.get('tipo_dado', {}).get('tipo', 'VARCHAR'))
+        for coluna in info_tabela['colunas']
+    ]
+    chave = json.dumps([info_tabela['nome'], info_tabela.get('descricao', ''), colunas], ensure_ascii=False)
+    return hashlib.blake2b(chave.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def reaproveitar_saida(caminho_existente: str, caminho_saida: str) -> bool:
+    """
+    Publica uma saída idêntica já gravada no novo caminho, sem reescrever os bytes.
+    
+    Args:
+        caminho_existente: Arquivo gerado anteriormente com o mesmo conteúdo
+        caminho_saida: Caminho onde a saída é esperada
+        
+    Returns:
+        True se a saída foi reaproveitada, False se precisa ser gerada
+    """
+    if not os.path.exists(caminho_existente):
+        return False
+    
+    if os.path.abspath(caminho_existente) == os.path.abspath(caminho_saida):
+        return True
+    
+    try:
+        if os.path.exists(caminho_saida):
+            os.remove(caminho_saida)
+        os.link(caminho_existente, caminho_saida)
+    except OSError:
+        return False
+    
+    return True
+
+
+PASTA_CACHE_DDL = ".cache"  # Cache em disco das tabelas já extraídas, usado pela linha de comando
+VERSAO_CACHE_DDL = 1  # Incrementar quando o formato de extrair_informacoes_tabela mudar
+
+
+def _caminho_cache_ddl(pasta_cache: str, conteudo_ddl: str) -> str:
+    """Caminho do cache de um DDL: o hash do conteúdo (e da versão do formato) é a chave."""
+    chave = hashlib.blake2b(f"{VERSAO_CACHE_DDL}:{conteudo_ddl}".encode('utf-8'), digest_size=16).hexdigest()
+    return os.path.join(pasta_cache, f"{chave}.pkl")
+
+
+def carregar_cache_ddl(pasta_cache: str, conteudo_ddl: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """
+    Busca no cache em disco a extração de um DDL já processado.
+    O cache é local e gerado pelo próprio conversor (pickle): não aponte
+    pasta_cache para diretórios que outras pessoas possam gravar.
+    
+    Args:
+        pasta_cache: Pasta do cache
+        conteudo_ddl: Conteúdo do arquivo DDL
+        
+    Returns:
+        Tupla (nome_tabela, info_tabela) ou None se o DDL não estiver no cache
+    """
+    try:
+        with open(_caminho_cache_ddl(pasta_cache, conteudo_ddl), 'rb') as arquivo:
+            return pickle.load(arquivo)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError) as e:
+        # Cache ilegível ou de outra versão: tratar como ausente e refazer a extração
+        logger.warning("Ignorando cache inválido do DDL: %s", e)
+        return None
+
+
+def salvar_cache_ddl(pasta_cache: str, conteudo_ddl: str, nome_tabela: str, info_tabela: Dict[str, Any]) -> None:
+    """
+    Grava no cache em disco a extração de um DDL. Falhas de gravação só são registradas no log.
+    
+    Args:
+        pasta_cache: Pasta do cache
+        conteudo_ddl: Conteúdo do arquivo DDL
+        nome_tabela: Nome da tabela extraído do DDL
+        info_tabela: Informações da tabela extraídas do DDL
+    """
+    caminho = _caminho_cache_ddl(pasta_cache, conteudo_ddl)
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(pasta_cache, exist_ok=True)
+        with open(temporario, 'wb') as arquivo:
+            pickle.dump((nome_tabela, info_tabela), arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+        # Publicação atômica: processos paralelos nunca leem um cache pela metade
+        os.replace(temporario, caminho)
+    except OSError as e:
+        logger.warning("Não foi possível gravar o cache do DDL: %s", e)
+        try:
+            os.remove(temporario)
+        except OSError:
+            pass
+
+
+def processar_arquivo_ddl(caminho_ddl: str, pasta_saida: str = "output",
+                          memo_saida: Optional[Dict[str, str]] = None,
+                          conteudo_ddl: Optional[str] = None,
+                          pasta_cache: Optional[str] = None) -> Dict[str, Any]:
     """
     Processa um único arquivo DDL e retorna informações do processamento.
     Gera apenas o arquivo CSV. O JSON é gerado separadamente pelo json_generator.py
@@ -670,25 +1061,49 @@ def processar_arquivo_ddl(caminho_ddl: str, pasta_saida: str = "output") -> Dict
     Args:
         caminho_ddl: Caminho para o arquivo DDL
         pasta_saida: Pasta onde salvar os arquivos de saída
+        memo_saida: Mapa opcional assinatura -> CSV já gerado; tabelas com a mesma
+            assinatura reaproveitam o arquivo (hard link) em vez de reescrevê-lo
+        conteudo_ddl: Conteúdo já lido do arquivo (opcional; se omitido o arquivo é lido aqui)
+        pasta_cache: Pasta do cache em disco das extrações (opcional); um DDL já
+            extraído antes não passa de novo pelos regex
         
     Returns:
-        Dicionário com informações do processamento
+        Dicionário com informações do processamento (inclui a 'assinatura' da
+        tabela quando memo_saida é informado, para atualizar o mapa do chamador)
     """
+    assinatura = None
     try:
         # Ler e processar DDL
-        conteudo_ddl = ler_arquivo_ddl(caminho_ddl)
-        nome_tabela = extrair_nome_tabela(conteudo_ddl)
-        info_tabela = extrair_informacoes_tabela(conteudo_ddl, nome_tabela)
+        if conteudo_ddl is None:
+            conteudo_ddl = ler_arquivo_ddl(caminho_ddl)
+        em_cache = carregar_cache_ddl(pasta_cache, conteudo_ddl) if pasta_cache else None
+        if em_cache is not None:
+            nome_tabela, info_tabela = em_cache
+        else:
+            comandos = separar_comandos(conteudo_ddl)
+            nome_tabela = extrair_nome_tabela(conteudo_ddl, comandos)
+            info_tabela = extrair_informacoes_tabela(conteudo_ddl, nome_tabela, comandos)
+            if pasta_cache:
+                salvar_cache_ddl(pasta_cache, conteudo_ddl, nome_tabela, info_tabela)
         
         # Salvar CSV para referência (diretamente na pasta de saída)
         caminho_csv = os.path.join(pasta_saida, f"{nome_tabela}.csv")
-        criar_dicionario_csv(info_tabela, caminho_csv)
+        
+        if memo_saida is None:
+            criar_dicionario_csv(info_tabela, caminho_csv)
+        else:
+            assinatura = assinatura_tabela(info_tabela)
+            existente = memo_saida.get(assinatura)
+            if existente is None or not reaproveitar_saida(existente, caminho_csv):
+                criar_dicionario_csv(info_tabela, caminho_csv)
+                memo_saida[assinatura] = caminho_csv
         
         return {
             'sucesso': True,
             'nome_tabela': nome_tabela,
             'caminho_csv': caminho_csv,
             'num_colunas': len(info_tabela['colunas']),
+            'assinatura': assinatura,
             'erro': None
         }
         
@@ -698,10 +1113,59 @@ def processar_arquivo_ddl(caminho_ddl: str, pasta_saida: str = "output") -> Dict
             'nome_tabela': None,
             'caminho_csv': None,
             'num_colunas': 0,
+            'assinatura': None,
             'erro': str(e)
         }
 
 
+DDL_LEITURAS_ANTECIPADAS = 4  # Arquivos do lote lidos à frente do que está sendo processado
+
+
+def _ler_ddl_antecipado(caminho_ddl: str) -> Optional[str]:
+    """Lê o DDL em segundo plano; em caso de erro devolve None e processar_arquivo_ddl refaz a leitura e reporta o erro."""
+    try:
+        return ler_arquivo_ddl(caminho_ddl)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def processar_arquivos_ddl(caminhos_ddl: List[str], pasta_saida: str = "output",
+                           memo_saida: Optional[Dict[str, str]] = None,
+                           pasta_cache: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Processa um lote de arquivos DDL numa única chamada.
+    Ponto de entrada usado pelo pool de parsing: um envio por lote em vez de um por arquivo,
+    com o mesmo memo de saídas compartilhado entre os arquivos do lote. Os próximos
+    arquivos do lote são lidos em segundo plano enquanto o atual é processado.
+    
+    Args:
+        caminhos_ddl: Caminhos dos arquivos DDL
+        pasta_saida: Pasta onde salvar os arquivos de saída
+        memo_saida: Mapa opcional assinatura -> CSV já gerado (ver processar_arquivo_ddl)
+        pasta_cache: Pasta do cache em disco das extrações (ver processar_arquivo_ddl)
+        
+    Returns:
+        Lista com o resultado de processar_arquivo_ddl de cada arquivo, na mesma ordem
+    """
+    if len(caminhos_ddl) < 2:
+        return [processar_arquivo_ddl(caminho, pasta_saida, memo_saida, pasta_cache=pasta_cache)
+                for caminho in caminhos_ddl]
+    
+    resultados = []
+    with ThreadPoolExecutor(max_workers=DDL_LEITURAS_ANTECIPADAS) as leitor:
+        restantes = iter(caminhos_ddl)
+        leituras = deque(
+            (caminho, leitor.submit(_ler_ddl_antecipado, caminho))
+            for caminho in itertools.islice(restantes, DDL_LEITURAS_ANTECIPADAS)
+        )
+        while leituras:
+            caminho, leitura = leituras.popleft()
+            proximo = next(restantes, None)
+            if proximo is not None:
+                leituras.append((proximo, leitor.submit(_ler_ddl_antecipado, proximo)))
+            resultados.append(processar_arquivo_ddl(caminho, pasta_saida, memo_saida, leitura.result(), pasta_cache))
+    return resultados
+
 def exibir_erro_critico(mensagem_erro: str):
     """
     Exibe erro crítico com informações de contato.
@@ -723,6 +1187,7 @@ def main():
     Função principal do conversor DDL para MLOps - Versão Automatizada.
     Gera apenas o arquivo CSV. Para gerar JSON, use o json_generator.py
     """
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
     print("=== Conversor DDL para Configuracoes MLOps - Gerador CSV ===\n")
     
     try:
@@ -735,13 +1200,34 @@ def main():
             print("Coloque seus arquivos .txt na pasta ddls/ e execute novamente.")
             return
         
-        # Validar se há apenas 1 arquivo DDL
+        # Vários DDLs: cada arquivo é independente, então são processados em paralelo
         if len(arquivos_ddl) > 1:
-            print(f"[AVISO] Encontrados {len(arquivos_ddl)} arquivos DDL:")
+            print(f"[ENCONTRADO] {len(arquivos_ddl)} arquivos DDL:")
             for arquivo in arquivos_ddl:
                 print(f"   - {arquivo}")
-            print("\nATENCAO: Coloque apenas 1 arquivo DDL por vez na pasta ddls/")
-            print("Remova os arquivos extras e execute novamente.")
+            print(f"\n[INICIANDO PROCESSAMENTO] {len(arquivos_ddl)} arquivos")
+            print("="*60)
+            
+            max_workers = min(os.cpu_count() or 1, len(arquivos_ddl))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                processar = functools.partial(processar_arquivo_ddl, pasta_cache=PASTA_CACHE_DDL)
+                resultados = list(executor.map(processar, arquivos_ddl))
+            
+            falhas = 0
+            for caminho_ddl, resultado in zip(arquivos_ddl, resultados):
+                if resultado['sucesso']:
+                    print(f"[OK] {caminho_ddl} -> {resultado['caminho_csv']}")
+                else:
+                    falhas += 1
+                    print(f"[ERRO] {caminho_ddl}: {resultado['erro']}")
+            
+            print("\n" + "="*60)
+            print(f"[RESUMO] {len(resultados) - falhas} de {len(resultados)} arquivos processados com sucesso")
+            print("="*60)
+            if falhas:
+                exibir_erro_critico(f"{falhas} arquivo(s) DDL não puderam ser processados")
+            else:
+                print("\nPróxima etapa: Use json_generator.py para gerar o JSON")
             return
         
         print(f"[ENCONTRADO] 1 arquivo DDL: {arquivos_ddl[0]}")
@@ -751,7 +1237,7 @@ def main():
         print(f"\n[INICIANDO PROCESSAMENTO] {caminho_ddl}")
         print("="*60)
         
-        resultado = processar_arquivo_ddl(caminho_ddl)
+        resultado = processar_arquivo_ddl(caminho_ddl, pasta_cache=PASTA_CACHE_DDL)
         
         if resultado['sucesso']:
             # Mensagem final de sucesso
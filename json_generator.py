@@ -21,9 +21,24 @@ Autor: Felipe Machado
 
 import json
 import csv
+import io
+import itertools
+import logging
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # Opcional: sem orjson o JSON é lido e gravado com o json da stdlib
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+JSON_BUFFER_SIZE = 1024 * 1024  # Buffer de escrita do JSON gravado campo a campo
 
 
 def ler_csv_preenchido(caminho_arquivo: str) -> List[Dict[str, str]]:
@@ -34,44 +49,107 @@ def ler_csv_preenchido(caminho_arquivo: str) -> List[Dict[str, str]]:
         caminho_arquivo: Caminho do arquivo CSV
         
     Returns:
-        Lista de dicionários com dados do CSV
+        Lista de dicionários com dados do CSV (valores sempre texto; campos
+        ausentes numa linha ficam vazios)
         
     Raises:
         FileNotFoundError: Se o arquivo não existir
         ValueError: Se algum campo obrigatório estiver vazio
     """
-    if not Path(caminho_arquivo).exists():
+    dados = _ler_linhas_csv(caminho_arquivo)
+    validar_dados_csv(dados)
+    return dados
+
+
+def _ler_linhas_csv(caminho_arquivo: str) -> List[Dict[str, str]]:
+    """Lê as linhas do CSV preenchido, sem validá-las (ver ler_csv_preenchido)."""
+    # Abrir direto (sem consultar exists() antes): um stat a menos por leitura
+    try:
+        with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
+            texto = arquivo.read()
+    except FileNotFoundError:
         raise FileNotFoundError(f"Arquivo CSV não encontrado: {caminho_arquivo}")
     
-    with open(caminho_arquivo, 'r', encoding='utf-8') as arquivo:
-        reader = csv.DictReader(arquivo, delimiter=';')
-        dados = list(reader)
+    # Sem aspas no arquivo não há campos com ';' ou quebras de linha embutidos:
+    # cada linha é dividida direto com split, sem o parser do módulo csv.
+    # O modo texto já converteu \r\n e \r em \n
+    if '"' not in texto and '\0' not in texto:
+        linhas = texto.split('\n')
+        registros = (linha.split(';') for linha in linhas if linha)
+        cabecalho = linhas[0].split(';') if linhas[0] else []
+        if linhas[0]:
+            next(registros)
+    else:
+        # csv.reader entrega listas, com as aspas e escapes tratados
+        registros = csv.reader(io.StringIO(texto), delimiter=';')
+        cabecalho = next(registros, [])
     
+    # O dicionário de cada linha sai de um único zip com o cabeçalho,
+    # já no formato normalizado de processar_linhas_para_json
+    num_campos = len(cabecalho)
+    return [
+        dict(zip(cabecalho, valores)) if len(valores) >= num_campos
+        else dict(itertools.zip_longest(cabecalho, valores, fillvalue=''))
+        for valores in registros
+        if valores  # Linhas em branco são ignoradas, como no DictReader
+    ]
+
+
+def validar_dados_csv(dados: List[Dict[str, str]]) -> None:
+    """
+    Valida as linhas do dicionário (lidas do CSV ou recebidas em memória).
+    
+    Args:
+        dados: Lista de dicionários com as linhas do dicionário
+        
+    Raises:
+        ValueError: Se não houver linhas ou algum campo obrigatório estiver vazio
+    """
     if not dados:
         raise ValueError("Arquivo CSV vazio")
     
     # Validar preenchimento dos campos obrigatórios
     # descricao_oficial pode ficar vazia (será tratada adiante)
-    campos_obrigatorios = ['coluna_mf', 'rename_to']
     for linha_num, linha in enumerate(dados, start=2):  # Começa em 2 (header é 1)
         coluna_mf = linha.get('coluna_mf', '').strip()
         
         # Ignorar colunas removidas
-        if '[REMOVIDA]' in coluna_mf:
+        if MARCADOR_COLUNA_REMOVIDA in coluna_mf:
             continue
         
-        for campo in campos_obrigatorios:
-            if campo not in linha:
-                raise ValueError(f"Campo obrigatório '{campo}' não encontrado no CSV")
-            
-            valor = linha.get(campo, '').strip()
-            if not valor:
-                raise ValueError(
-                    f"Campo '{campo}' da coluna '{coluna_mf}' "
-                    f"(linha {linha_num}) está vazio. Preencha o dicionário antes de continuar."
-                )
-    
-    return dados
+        erro = _erro_linha_incompleta(linha, coluna_mf, linha_num)
+        if erro is not None:
+            raise erro
+
+
+def _erro_linha_incompleta(linha: Dict[str, str], coluna_mf: str, linha_num: int) -> Optional[ValueError]:
+    """Erro do primeiro campo obrigatório ausente ou vazio da linha, ou None se a linha estiver completa."""
+    for campo in CAMPOS_OBRIGATORIOS_CSV:
+        if campo not in linha:
+            return ValueError(f"Campo obrigatório '{campo}' não encontrado no CSV")
+        
+        if not linha[campo].strip():
+            return ValueError(
+                f"Campo '{campo}' da coluna '{coluna_mf}' "
+                f"(linha {linha_num}) está vazio. Preencha o dicionário antes de continuar."
+            )
+    return None
+
+
+# Tabelas de conversão de tipos, montadas uma única vez na importação
+MAPEAMENTO_TIPOS_MLOPS = {
+    'DATE': 'date',
+    'CHAR': 'string',
+    'VARCHAR': 'string',
+    'TIMESTAMP': 'timestamp',
+    'TIME': 'string',
+    'INTEGER': 'integer',
+    'INT': 'integer',
+    'SMALLINT': 'integer',
+}
+TIPOS_INTEIROS = frozenset({'INTEGER', 'INT', 'SMALLINT'})
+CAMPOS_OBRIGATORIOS_CSV = ('coluna_mf', 'rename_to')  # descricao_oficial pode ficar vazia
+MARCADOR_COLUNA_REMOVIDA = '[REMOVIDA]'  # Sufixo que o comparador põe nas colunas fora do DDL
 
 
 def converter_tipo_para_mlops(tipo_dado: str) -> str:
@@ -84,18 +162,7 @@ def converter_tipo_para_mlops(tipo_dado: str) -> str:
     Returns:
         Tipo de dado no formato MLOps
     """
-    mapeamento_tipos = {
-        'DATE': 'date',
-        'CHAR': 'string',
-        'VARCHAR': 'string',
-        'TIMESTAMP': 'timestamp',
-        'TIME': 'string',
-        'INTEGER': 'integer',
-        'INT': 'integer',
-        'SMALLINT': 'integer',
-    }
-    
-    return mapeamento_tipos.get(tipo_dado, 'string')
+    return MAPEAMENTO_TIPOS_MLOPS.get(tipo_dado, 'string')
 
 
 def gerar_curacoes(tipo_original: str) -> List[Dict[str, Any]]:
@@ -110,7 +177,7 @@ def gerar_curacoes(tipo_original: str) -> List[Dict[str, Any]]:
     """
     curacoes = []
     
-    if tipo_original in ['INTEGER', 'INT', 'SMALLINT']:
+    if tipo_original in TIPOS_INTEIROS:
         curacoes.append({
             "name": "StringToType",
             "input": "integer",
@@ -139,68 +206,89 @@ def gerar_campos_auditoria() -> List[Dict[str, Any]]:
     return []
 
 
-def criar_configuracao_mlops(dados_csv: List[Dict[str, str]], nome_tabela: str) -> Dict[str, Any]:
+def gerar_campos_mlops(dados_csv: Iterable[Dict[str, str]], validar: bool = False) -> Iterator[Dict[str, Any]]:
     """
-    Cria configuração MLOps baseada nos dados do CSV.
+    Gera, um a um, os campos MLOps das linhas do CSV.
     
     Args:
         dados_csv: Dados lidos do arquivo CSV
-        nome_tabela: Nome da tabela
+        validar: Se True, uma linha incompleta gera o mesmo ValueError de validar_dados_csv
+            (na mesma passada que gera os campos) em vez de ser pulada com aviso
         
-    Returns:
-        Configuração MLOps em formato de dicionário
+    Yields:
+        Campo MLOps (name, type, nullable, metadata) de cada coluna válida
+        
+    Raises:
+        ValueError: Com validar=True, se algum campo obrigatório estiver vazio
     """
-    campos = []
+    # Tipo MLOps, jsonParameterName e curações resolvidos uma vez por tipo original;
+    # as curações são compartilhadas pelos campos do mesmo tipo
+    por_tipo = {}
+    
+    # Colunas ignoradas: registradas num único aviso por motivo, ao final
+    removidas = []
+    incompletas = []
     
     # Processar cada linha do CSV
-    for linha in dados_csv:
-        coluna_mf = linha.get('coluna_mf', '').strip()
-        rename_to = linha.get('rename_to', '').strip()
-        descricao_oficial = linha.get('descricao_oficial', '').strip()
-        tipo_original = linha.get('tipo_original', 'string').strip()
+    for linha_num, linha in enumerate(dados_csv, start=2):  # Começa em 2 (header é 1)
+        get = linha.get
+        coluna_mf = get('coluna_mf', '').strip()
+        rename_to = get('rename_to', '').strip()
+        descricao_oficial = get('descricao_oficial', '').strip()
+        # Poucos tipos distintos repetidos em todas as linhas: internar faz os campos
+        # compartilharem o mesmo objeto de inputType em vez de uma cópia por linha
+        tipo_original = sys.intern(get('tipo_original', 'string').strip())
         
         # Ignorar colunas removidas
-        if '[REMOVIDA]' in coluna_mf:
-            print(f"[AVISO] Ignorando coluna removida: {coluna_mf}")
+        if MARCADOR_COLUNA_REMOVIDA in coluna_mf:
+            removidas.append(coluna_mf)
             continue
         
         # Exigir apenas coluna e rename_to; descricao_oficial pode ficar vazia
         if not coluna_mf or not rename_to:
-            print(f"[AVISO] Pulando linha incompleta (coluna ou rename_to vazios): {coluna_mf}")
+            if validar:
+                raise _erro_linha_incompleta(linha, coluna_mf, linha_num)
+            incompletas.append(coluna_mf)
             continue
         
-        # Converter tipo para MLOps
-        tipo_mlops = converter_tipo_para_mlops(tipo_original)
+        # Converter tipo para MLOps e determinar jsonParameterName e curações
+        info_tipo = por_tipo.get(tipo_original)
+        if info_tipo is None:
+            info_tipo = por_tipo[tipo_original] = (
+                converter_tipo_para_mlops(tipo_original),
+                "int" if tipo_original in TIPOS_INTEIROS else "string",
+                gerar_curacoes(tipo_original)
+            )
+        tipo_mlops, json_param_name, curacoes = info_tipo
         
-        # Determinar jsonParameterName baseado no tipo
-        json_param_name = "int" if tipo_original in ['INTEGER', 'INT', 'SMALLINT'] else "string"
+        # Metadados completos (com as curações, se houver) antes de montar o campo
+        metadata = {
+            "description": descricao_oficial,
+            "inputType": tipo_original,
+            "outputType": tipo_mlops,
+            "renameTo": rename_to,
+            "jsonParameterName": json_param_name
+        }
+        if curacoes:
+            metadata["curations"] = curacoes
         
-        # Criar campo
-        campo = {
+        yield {
             "name": coluna_mf,
             "type": tipo_mlops,
             "nullable": True,
-            "metadata": {
-                "description": descricao_oficial,
-                "inputType": tipo_original,
-                "outputType": tipo_mlops,
-                "renameTo": rename_to,
-                "jsonParameterName": json_param_name
-            }
+            "metadata": metadata
         }
-        
-        # Adicionar curações se necessário
-        curacoes = gerar_curacoes(tipo_original)
-        if curacoes:
-            campo["metadata"]["curations"] = curacoes
-        
-        campos.append(campo)
     
-    # Adicionar campos de auditoria
-    campos.extend(gerar_campos_auditoria())
-    
-    # Criar configuração final
-    configuracao = {
+    if removidas:
+        logger.warning("Ignorando %s coluna(s) removida(s): %s", len(removidas), ', '.join(removidas))
+    if incompletas:
+        logger.warning("Pulando %s linha(s) incompleta(s) (coluna ou rename_to vazios): %s",
+                       len(incompletas), ', '.join(incompletas))
+
+
+def _estrutura_configuracao(nome_tabela: str, campos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Monta o dicionário da configuração MLOps em volta da lista de campos."""
+    return {
         nome_tabela: {
             "delimiter": "|",
             "format": "csv",
@@ -211,30 +299,153 @@ def criar_configuracao_mlops(dados_csv: List[Dict[str, str]], nome_tabela: str)
             }
         }
     }
+
+
+def criar_configuracao_mlops(dados_csv: List[Dict[str, str]], nome_tabela: str) -> Dict[str, Any]:
+    """
+    Cria configuração MLOps baseada nos dados do CSV.
+    
+    Args:
+        dados_csv: Dados lidos do arquivo CSV
+        nome_tabela: Nome da tabela
+        
+    Returns:
+        Configuração MLOps em formato de dicionário
+    """
+    campos = list(gerar_campos_mlops(dados_csv))
     
-    return configuracao
+    # Adicionar campos de auditoria
+    campos.extend(gerar_campos_auditoria())
+    
+    return _estrutura_configuracao(nome_tabela, campos)
+
+
+def _serializar_json(objeto: Any, indentado: bool = True) -> bytes:
+    """Serializa em UTF-8 (indentação de 2 ou compacto); usa orjson quando disponível (mesmo layout da stdlib)."""
+    if orjson is not None:
+        return orjson.dumps(objeto, option=orjson.OPT_INDENT_2) if indentado else orjson.dumps(objeto)
+    if indentado:
+        return json.dumps(objeto, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(objeto, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
 
 
-def salvar_configuracao_json(configuracao: Dict[str, Any], caminho_saida: str) -> None:
+def salvar_configuracao_json(configuracao: Dict[str, Any], caminho_saida: str, indentado: bool = True) -> None:
     """
     Salva configuração MLOps em arquivo JSON.
     
     Args:
         configuracao: Configuração MLOps
         caminho_saida: Caminho onde salvar o arquivo
+        indentado: Se True (padrão), grava indentado para leitura humana; se False,
+            grava compacto (menor e mais rápido, para consumo só por máquinas)
     """
     Path(caminho_saida).parent.mkdir(parents=True, exist_ok=True)
+    Path(caminho_saida).write_bytes(_serializar_json(configuracao, indentado))
+
+
+def gravar_configuracao_mlops(campos: Iterable[Dict[str, Any]], nome_tabela: str, caminho_saida: str) -> None:
+    """
+    Grava a configuração MLOps campo a campo, sem montar a lista de campos em memória.
+    O arquivo fica idêntico ao de salvar_configuracao_json com a configuração completa.
     
-    with open(caminho_saida, 'w', encoding='utf-8') as arquivo:
-        json.dump(configuracao, arquivo, indent=4, ensure_ascii=False)
+    Args:
+        campos: Campos da tabela (pode ser um gerador)
+        nome_tabela: Nome da tabela
+        caminho_saida: Caminho onde salvar o arquivo
+    """
+    Path(caminho_saida).parent.mkdir(parents=True, exist_ok=True)
+    
+    # Serializar o esqueleto com a lista vazia e dividi-lo onde entram os campos
+    esqueleto = _serializar_json(_estrutura_configuracao(nome_tabela, []))
+    inicio, fim = esqueleto.split(b'"fields": []', 1)
+    recuo = b' ' * (len(inicio) - inicio.rfind(b'\n') - 1)
+    recuo_campo = b'\n' + recuo + b'  '
+    
+    # Gravar em arquivo temporário e publicar com os.replace: uma falha no meio
+    # não deixa um JSON truncado no lugar do anterior
+    caminho_temp = f"{caminho_saida}.{os.getpid()}.tmp"
+    try:
+        with open(caminho_temp, 'wb', buffering=JSON_BUFFER_SIZE) as arquivo:
+            arquivo.write(inicio + b'"fields": [')
+            separador = recuo_campo
+            for campo in campos:
+                # Strings JSON não contêm quebras de linha, então só a indentação muda
+                arquivo.write(separador + _serializar_json(campo).replace(b'\n', recuo_campo))
+                separador = b',' + recuo_campo
+            arquivo.write((b'\n' + recuo + b']' if separador != recuo_campo else b']') + fim)
+        os.replace(caminho_temp, caminho_saida)
+    except BaseException:
+        try:
+            os.remove(caminho_temp)
+        except OSError:
+            pass
+        raise
 
 
-def processar_csv_para_json(caminho_csv: str, caminho_json_saida: str, caminho_json_antigo: str = None) -> Dict[str, Any]:
+def ler_campos_auditoria(caminho_json_antigo: Optional[str]) -> List[Dict[str, Any]]:
     """
-    Processa um arquivo CSV e gera o arquivo JSON correspondente.
+    Lê os campos de auditoria (AUD_*) existentes no JSON antigo.
     
     Args:
-        caminho_csv: Caminho para o arquivo CSV
+        caminho_json_antigo: Caminho do JSON antigo (opcional)
+        
+    Returns:
+        Campos de auditoria de todas as tabelas do JSON antigo, na ordem em que aparecem
+    """
+    campos_auditoria = []
+    if not caminho_json_antigo:
+        return campos_auditoria
+    
+    try:
+        conteudo = Path(caminho_json_antigo).read_bytes()
+    except FileNotFoundError:
+        return campos_auditoria
+    except OSError as e:
+        logger.warning("Não foi possível ler campos de auditoria do JSON antigo: %s", e)
+        return campos_auditoria
+    
+    try:
+        json_antigo = orjson.loads(conteudo) if orjson is not None else json.loads(conteudo.decode('utf-8'))
+        
+        # Procurar campos de auditoria no JSON antigo (um extend filtrado por tabela)
+        for tabela_info in json_antigo.values():
+            # Valores de topo fora do formato {'structure': {'fields': [...]}} são ignorados
+            try:
+                campos = tabela_info['structure']['fields']
+            except (TypeError, KeyError):
+                continue
+            campos_auditoria.extend(
+                campo for campo in campos if campo.get('name', '').startswith('AUD_')
+            )
+    except Exception as e:
+        logger.warning("Não foi possível ler campos de auditoria do JSON antigo: %s", e)
+    
+    return campos_auditoria
+
+
+def adicionar_campos_auditoria(configuracao: Dict[str, Any], nome_tabela: str,
+                               caminho_json_antigo: Optional[str]) -> None:
+    """
+    Copia para a configuração os campos de auditoria (AUD_*) existentes no JSON antigo.
+    
+    Args:
+        configuracao: Configuração MLOps gerada (alterada no lugar)
+        nome_tabela: Nome da tabela na configuração
+        caminho_json_antigo: Caminho do JSON antigo (opcional)
+    """
+    campos_auditoria = ler_campos_auditoria(caminho_json_antigo)
+    if campos_auditoria and nome_tabela in configuracao:
+        configuracao[nome_tabela]['structure']['fields'].extend(campos_auditoria)
+
+
+def processar_linhas_para_json(dados_csv: List[Dict[str, Any]], nome_tabela: str,
+                               caminho_json_saida: str, caminho_json_antigo: str = None) -> Dict[str, Any]:
+    """
+    Gera o arquivo JSON a partir das linhas do dicionário já em memória.
+    
+    Args:
+        dados_csv: Linhas do dicionário (mesmas colunas do CSV)
+        nome_tabela: Nome da tabela
         caminho_json_saida: Caminho onde salvar o arquivo JSON
         caminho_json_antigo: Caminho do JSON antigo (opcional, para verificar campos de auditoria)
         
@@ -242,40 +453,42 @@ def processar_csv_para_json(caminho_csv: str, caminho_json_saida: str, caminho_j
         Dicionário com informações do processamento
     """
     try:
-        # Ler CSV
-        dados_csv = ler_csv_preenchido(caminho_csv)
-        
-        # Extrair nome da tabela do CSV ou do nome do arquivo
-        nome_tabela = Path(caminho_csv).stem.upper()
-        
-        # Criar configuração MLOps
-        configuracao = criar_configuracao_mlops(dados_csv, nome_tabela)
-        
-        # Se houver JSON antigo, adicionar campos de auditoria que existem nele
-        if caminho_json_antigo and Path(caminho_json_antigo).exists():
-            try:
-                with open(caminho_json_antigo, 'r', encoding='utf-8') as f:
-                    json_antigo = json.load(f)
-                
-                # Procurar campos de auditoria no JSON antigo
-                for tabela_nome, tabela_info in json_antigo.items():
-                    if isinstance(tabela_info, dict) and 'structure' in tabela_info:
-                        estrutura = tabela_info['structure']
-                        if 'fields' in estrutura:
-                            campos_auditoria = []
-                            for campo in estrutura['fields']:
-                                nome_campo = campo.get('name', '')
-                                if nome_campo.startswith('AUD_'):
-                                    campos_auditoria.append(campo)
-                            
-                            # Adicionar campos de auditoria ao JSON novo
-                            if campos_auditoria and nome_tabela in configuracao:
-                                configuracao[nome_tabela]['structure']['fields'].extend(campos_auditoria)
-            except Exception as e:
-                print(f"[AVISO] Não foi possível ler campos de auditoria do JSON antigo: {str(e)}")
+        # Normalizar como se as linhas tivessem vindo de um CSV (valores sempre texto)
+        dados_csv = [
+            {campo: '' if valor is None else str(valor) for campo, valor in linha.items()}
+            for linha in dados_csv
+        ]
+    except Exception as e:
+        return {
+            'sucesso': False,
+            'nome_tabela': None,
+            'caminho_json': None,
+            'num_colunas': 0,
+            'erro': str(e)
+        }
+    
+    return _gravar_json_das_linhas(dados_csv, nome_tabela, caminho_json_saida, caminho_json_antigo)
+
+
+def _gravar_json_das_linhas(dados_csv: List[Dict[str, str]], nome_tabela: str,
+                            caminho_json_saida: str, caminho_json_antigo: Optional[str]) -> Dict[str, Any]:
+    """
+    Grava o JSON a partir de linhas já normalizadas (ver processar_linhas_para_json).
+    A validação acontece na mesma passada que gera os campos: uma linha incompleta
+    interrompe a gravação e o arquivo temporário é descartado.
+    """
+    try:
+        if not dados_csv:
+            raise ValueError("Arquivo CSV vazio")
         
-        # Salvar JSON
-        salvar_configuracao_json(configuracao, caminho_json_saida)
+        # Campos gerados sob demanda, seguidos dos campos de auditoria que
+        # existirem no JSON antigo, gravados direto no arquivo
+        campos = itertools.chain(
+            gerar_campos_mlops(dados_csv, validar=True),
+            gerar_campos_auditoria(),
+            ler_campos_auditoria(caminho_json_antigo)
+        )
+        gravar_configuracao_mlops(campos, nome_tabela, caminho_json_saida)
         
         return {
             'sucesso': True,
@@ -295,6 +508,63 @@ def processar_csv_para_json(caminho_csv: str, caminho_json_saida: str, caminho_j
         }
 
 
+def processar_csv_para_json(caminho_csv: str, caminho_json_saida: str, caminho_json_antigo: str = None) -> Dict[str, Any]:
+    """
+    Processa um arquivo CSV e gera o arquivo JSON correspondente.
+    
+    Args:
+        caminho_csv: Caminho para o arquivo CSV
+        caminho_json_saida: Caminho onde salvar o arquivo JSON
+        caminho_json_antigo: Caminho do JSON antigo (opcional, para verificar campos de auditoria)
+        
+    Returns:
+        Dicionário com informações do processamento
+    """
+    try:
+        # Ler CSV (linhas já normalizadas; a validação é feita junto com a geração)
+        dados_csv = _ler_linhas_csv(caminho_csv)
+    except Exception as e:
+        return {
+            'sucesso': False,
+            'nome_tabela': None,
+            'caminho_json': None,
+            'num_colunas': 0,
+            'erro': str(e)
+        }
+    
+    # Extrair nome da tabela do CSV ou do nome do arquivo
+    nome_tabela = Path(caminho_csv).stem.upper()
+    
+    return _gravar_json_das_linhas(dados_csv, nome_tabela, caminho_json_saida, caminho_json_antigo)
+
+
+def processar_csvs_para_json(pares: Sequence[Tuple[str, str]], caminho_json_antigo: str = None,
+                             max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Processa vários CSVs (uma tabela cada) em paralelo, em processos separados.
+    Cada tabela é independente e o trabalho é de CPU no interpretador, então
+    processos escalam com os núcleos onde threads ficariam presas ao GIL.
+    
+    Args:
+        pares: Pares (caminho_csv, caminho_json_saida)
+        caminho_json_antigo: Caminho do JSON antigo (opcional, para verificar campos de auditoria)
+        max_workers: Número máximo de processos (padrão: núcleos disponíveis)
+        
+    Returns:
+        Lista com o resultado de processar_csv_para_json de cada par, na mesma ordem
+    """
+    # Um único CSV não compensa o custo de subir o pool
+    if len(pares) < 2:
+        return [processar_csv_para_json(caminho_csv, caminho_json, caminho_json_antigo)
+                for caminho_csv, caminho_json in pares]
+    
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pares))
+    caminhos_csv, caminhos_json = zip(*pares)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(processar_csv_para_json, caminhos_csv, caminhos_json,
+                                 itertools.repeat(caminho_json_antigo)))
+
+
 def exibir_erro_critico(mensagem_erro: str):
     """
     Exibe erro crítico com informações de contato.
@@ -315,6 +585,7 @@ def main():
     """
     Função principal do gerador JSON MLOps a partir de CSV.
     """
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
     import sys
     
     print("=== Gerador JSON MLOps a partir de CSV ===\n")
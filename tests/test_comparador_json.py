@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do mapeamento do JSON antigo: leitura inteira x streaming (ijson)
+
+Execução: python -m unittest discover -s tests
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from comparador_json import (extrair_mapeamento_json, extrair_mapeamento_json_stream,
+                             ijson, ler_json_antigo)
+
+# Formatos que os dois caminhos devem rejeitar com ValueError
+JSONS_INVALIDOS = {
+    'topo_lista': [{'structure': {'fields': []}}],
+    'campo_numero': {'t': {'structure': {'fields': [1]}}},
+    'campo_texto': {'t': {'structure': {'fields': [{'name': 'a'}, 'b']}}},
+    'campo_lista': {'t': {'structure': {'fields': [[]]}}},
+    'campo_null': {'t': {'structure': {'fields': [None]}}},
+    'metadata_texto': {'t': {'structure': {'fields': [{'name': 'a', 'metadata': 'x'}]}}},
+    'fields_objeto': {'t': {'structure': {'fields': {'name': 'a'}}}},
+    'fields_texto': {'t': {'structure': {'fields': 'a'}}},
+}
+
+# Formatos aceitos (tabelas fora do formato são ignoradas)
+JSON_VALIDO = {
+    't': {'structure': {'fields': [
+        {'name': 'a', 'metadata': {'renameTo': 'A', 'description': 'd', 'inputType': 'int'}},
+        {'name': 'b'},
+    ]}},
+    'sem_fields': {'structure': {}},
+    'fields_null': {'structure': {'fields': None}},
+    'tabela_texto': 'x',
+    'tabela_lista': [{'structure': {'fields': [1]}}],
+}
+
+
+@unittest.skipIf(ijson is None, "ijson não instalado")
+class TestMapeamentoStream(unittest.TestCase):
+
+    def _gravar(self, dados):
+        arquivo = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8')
+        with arquivo:
+            json.dump(dados, arquivo)
+        self.addCleanup(os.remove, arquivo.name)
+        return arquivo.name
+
+    def test_invalidos_falham_nos_dois_caminhos(self):
+        for nome, dados in JSONS_INVALIDOS.items():
+            caminho = self._gravar(dados)
+            with self.subTest(nome, caminho='inteiro'):
+                with self.assertRaises(ValueError):
+                    extrair_mapeamento_json(ler_json_antigo(caminho))
+            with self.subTest(nome, caminho='stream'):
+                with self.assertRaises(ValueError):
+                    extrair_mapeamento_json_stream(caminho)
+
+    def test_valido_igual_nos_dois_caminhos(self):
+        caminho = self._gravar(JSON_VALIDO)
+        esperado = extrair_mapeamento_json(ler_json_antigo(caminho))
+        self.assertEqual(set(esperado), {'a', 'b'})
+        self.assertEqual(extrair_mapeamento_json_stream(caminho), esperado)
+
+
+if __name__ == '__main__':
+    unittest.main()
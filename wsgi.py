@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ponto de entrada WSGI
+=====================
+
+Expõe a aplicação Flask para servidores WSGI de produção (Gunicorn). Com
+workers gthread cada processo atende várias requisições em paralelo, e os
+downloads servidos por send_file saem pelo file wrapper do servidor, que
+usa sendfile(2) em vez de copiar o arquivo em blocos pelo Python.
+
+init_app() roda em cada worker: os jobs interrompidos são reivindicados na
+base de estado, então cada um é retomado por apenas um deles. Como cada
+worker também cria um pool de parsing com os.cpu_count() processos, em
+máquinas pequenas prefira um worker com mais threads (-w 1 --threads 16).
+
+Uso:
+    pip install gunicorn
+    gunicorn -k gthread --threads 8 -w 4 -b 0.0.0.0:5000 wsgi:application
+
+Autor: Felipe Machado
+"""
+
+from app import app, init_app
+
+init_app()
+
+application = app